@@ -12,6 +12,7 @@ class ESP():
         self.neurons_per_subpopulation = int(cfg['neurons_per_subpopulation'])
         self.n_networks = int(cfg['n_networks'])
         self.mutation_sigma = float(cfg['mutation_sigma'])
+        self.workers = int(cfg.get('workers', 1))
 
         self.n_inputs = env.get_num_sensors()
         self.n_bias = 1
@@ -45,14 +46,24 @@ class ESP():
         network_fitnesses = np.zeros(self.n_networks)
         counts = np.zeros((self.n_subpopulations, self.neurons_per_subpopulation))
 
-        for i in tqdm(range(self.n_networks), leave=False):
+        selects = []
+        nets = []
+        for i in range(self.n_networks):
             # Select random neurons to form a network
             select = np.random.choice(self.neurons_per_subpopulation, self.n_subpopulations)
             select = (np.arange(self.n_subpopulations), select)
             counts[select] += 1
-            net = self.create_network(select)
-            # Evaluate network
-            fitness, _, _, _, = self.env.play(pcont=net)
+            selects.append(select)
+            nets.append(self.create_network(select))
+
+        # Evaluate networks, serially with a progress bar or on the worker processes
+        if self.workers > 1:
+            results = self.env.play_many(nets, workers=self.workers)
+        else:
+            results = [self.env.play(pcont=net) for net in tqdm(nets, leave=False)]
+
+        for i, (select, net) in enumerate(zip(selects, nets)):
+            fitness, _, _, _, = results[i]
             if self.multiple == 'yes':
                 fitness = self.env.cons_multi(values=fitness)
             network_fitnesses[i] = fitness
@@ -6,11 +6,125 @@ import numpy as np
 def sigmoid_activation(x):
     return 1./(1.+np.exp(-x))
 
+# sigmoid of neat-python (steepened and clamped), applied to arrays
+def neat_sigmoid_activation(z):
+    z = np.clip(5.0*z, -60.0, 60.0)
+    return 1./(1.+np.exp(-z))
+
+
+# feed-forward network of a genome compiled into one dense weight matrix per layer.
+# node values live in a vector holding the inputs, then the nodes of every layer in order,
+# then a last slot that is always 0 (the value of outputs not connected to the inputs).
+# every array has a leading axis over genomes, so networks of equal topology can be stacked.
+class CompiledNetwork(object):
+
+    def __init__(self, signature, n_inputs, weights, biases, responses, outputs):
+        self.signature = signature
+        self.n_inputs = n_inputs
+        self.weights = weights      # per layer: (genomes, layer nodes, values before the layer)
+        self.biases = biases        # per layer: (genomes, layer nodes)
+        self.responses = responses  # per layer: (genomes, layer nodes)
+        self.outputs = outputs      # value index of every output node
+
+        self.n_values = n_inputs + sum(b.shape[1] for b in biases) + 1
+
+    # number of genomes in the network
+    def __len__(self):
+        return self.biases[0].shape[0] if self.biases else 1
+
+    # compiles a feed-forward genome, that must use the sum aggregation and the sigmoid activation
+    @staticmethod
+    def create(genome, config):
+        genome_config = config.genome_config
+        input_keys = list(genome_config.input_keys)
+        output_keys = list(genome_config.output_keys)
+
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        layers = [sorted(layer) for layer in neat.graphs.feed_forward_layers(input_keys, output_keys, connections)]
+
+        index = dict((key, i) for i, key in enumerate(input_keys))
+        for layer in layers:
+            for key in layer:
+                index[key] = len(index)
+
+        weights, biases, responses = [], [], []
+        n_before = len(input_keys)
+        for layer in layers:
+            w = np.zeros((1, len(layer), n_before))
+            b = np.zeros((1, len(layer)))
+            r = np.zeros((1, len(layer)))
+
+            for row, key in enumerate(layer):
+                ng = genome.nodes[key]
+                if ng.aggregation != 'sum' or ng.activation != 'sigmoid':
+                    raise ValueError("node %s uses %s/%s, only sum/sigmoid can be compiled" % (key, ng.aggregation, ng.activation))
+                b[0, row] = ng.bias
+                r[0, row] = ng.response
+
+            for cg in genome.connections.values():
+                if cg.enabled and cg.key[1] in layer:
+                    w[0, layer.index(cg.key[1]), index[cg.key[0]]] += cg.weight
+
+            weights.append(w)
+            biases.append(b)
+            responses.append(r)
+            n_before += len(layer)
+
+        zero = len(index)
+        outputs = np.array([index.get(key, zero) for key in output_keys])
+        signature = (tuple(input_keys), tuple(tuple(layer) for layer in layers), tuple(outputs))
+
+        return CompiledNetwork(signature, len(input_keys), weights, biases, responses, outputs)
+
+    # stacks networks of equal topology into one network evaluating all of them at once
+    @staticmethod
+    def stack(networks):
+        first = networks[0]
+        for network in networks:
+            if network.signature != first.signature:
+                raise ValueError("only networks of equal topology can be stacked")
+
+        layers = range(len(first.weights))
+        return CompiledNetwork(first.signature, first.n_inputs,
+                               [np.concatenate([n.weights[l] for n in networks]) for l in layers],
+                               [np.concatenate([n.biases[l] for n in networks]) for l in layers],
+                               [np.concatenate([n.responses[l] for n in networks]) for l in layers],
+                               first.outputs)
+
+    # activates the network for one row of inputs per genome, returning one row of outputs per genome
+    def activate_batch(self, inputs):
+        inputs = np.asarray(inputs, dtype=float).reshape(-1, self.n_inputs)
+        values = np.zeros((inputs.shape[0], self.n_values))
+        values[:, :self.n_inputs] = inputs
+
+        start = self.n_inputs
+        for w, b, r in zip(self.weights, self.biases, self.responses):
+            end = start + b.shape[1]
+            s = np.matmul(w, values[:, :start, None])[:, :, 0]
+            values[:, start:end] = neat_sigmoid_activation(b + r*s)
+            start = end
+
+        return values[:, self.outputs]
+
+    # activates a single genome network, the same way neat.nn.FeedForwardNetwork does
+    def activate(self, inputs):
+        values = np.zeros(self.n_values)
+        values[:self.n_inputs] = inputs
+
+        start = self.n_inputs
+        for w, b, r in zip(self.weights, self.biases, self.responses):
+            end = start + b.shape[1]
+            values[start:end] = neat_sigmoid_activation(b[0] + r[0]*w[0].dot(values[:start]))
+            start = end
+
+        return values[self.outputs]
+
+
 # player controller structure using NEAT
 class NeatController(Controller):
-    def __init__(self):
+    def __init__(self, config_file="NEAT-config.txt"):
         neat_dir = os.path.dirname(__file__)
-        neat_config = os.path.join(neat_dir, "NEAT-config.txt")
+        neat_config = os.path.join(neat_dir, config_file)
         config = neat.config.Config(neat.DefaultGenome,
                                     neat.DefaultReproduction,
                                     neat.DefaultSpeciesSet,
@@ -18,9 +132,40 @@ class NeatController(Controller):
                                     neat_config)
 
         self.config = config
+        self.config_file = neat_config
+        # compiled networks of the evaluated genomes, keyed by genome key
+        self.networks = {}
+        self.max_networks = 1000
+        self.batch_genomes = None
+        self.batch_groups = None
+
+    # gets the network of a genome, compiling it only the first time the genome is seen
+    def network(self, genome):
+        entry = self.networks.get(genome.key)
+        if entry is None or entry[0] is not genome:
+            # bounds the cache when nobody evicts it (e.g. in worker processes)
+            if len(self.networks) >= self.max_networks:
+                del self.networks[next(iter(self.networks))]
+            entry = (genome, self.compile(genome))
+            self.networks[genome.key] = entry
+        return entry[1]
+
+    # compiles a genome into numpy matrices, using neat's own network for what can not be compiled
+    def compile(self, genome):
+        try:
+            return CompiledNetwork.create(genome, self.config)
+        except ValueError:
+            return neat.nn.FeedForwardNetwork.create(genome, self.config)
+
+    # drops the networks of genomes that are not part of the population anymore
+    def evict(self, genomes):
+        keys = set(genome.key for genome in genomes)
+        for key in list(self.networks):
+            if key not in keys:
+                del self.networks[key]
 
     def control(self, input_sensors, genome):
-        network = neat.nn.FeedForwardNetwork.create(genome, self.config)
+        network = self.network(genome)
         output = network.activate(input_sensors)
 
         # takes decisions about sprite actions
@@ -51,6 +196,42 @@ class NeatController(Controller):
 
         return [left, right, jump, shoot, release]
 
+    # groups the genomes of a batch by topology, stacking the networks of every group
+    def group_batch(self, genomes):
+        groups = {}
+        for i, genome in enumerate(genomes):
+            network = self.network(genome)
+            key = network.signature if isinstance(network, CompiledNetwork) else ('single', i)
+            groups.setdefault(key, ([], []))
+            groups[key][0].append(i)
+            groups[key][1].append(network)
+
+        batch = []
+        for rows, networks in groups.values():
+            if isinstance(networks[0], CompiledNetwork):
+                batch.append((np.array(rows), CompiledNetwork.stack(networks)))
+            else:
+                batch.append((np.array(rows), networks[0]))
+        return batch
+
+    # controls a batch of games at once, one row of sensors per genome
+    def control_batch(self, inputs, genomes):
+        # groups are only rebuilt when the batch holds other genomes, compared one by one so that
+        # replacing a genome in the same list is seen
+        if self.batch_genomes is None or len(genomes) != len(self.batch_genomes) or \
+                any(a is not b for a, b in zip(genomes, self.batch_genomes)):
+            self.batch_genomes = list(genomes)
+            self.batch_groups = self.group_batch(genomes)
+
+        output = np.zeros((len(inputs), 5))
+        for rows, network in self.batch_groups:
+            if isinstance(network, CompiledNetwork):
+                output[rows] = network.activate_batch(inputs[rows])
+            else:
+                output[rows[0]] = network.activate(inputs[rows[0]])
+
+        return (output > 0.5).astype(int)
+
 class enemy_controller(Controller):
     def __init__(self, _n_hidden):
         self.n_hidden = [_n_hidden]
@@ -16,7 +16,7 @@ import pickle
 # game.state_to_log()  # checks environment state
 
 class NEAT_Spealist():
-    def __init__(self, env, gens, picklepath, logpath, mode):
+    def __init__(self, env, gens, picklepath, logpath, mode, workers=1):
         neat_dir = os.path.dirname(__file__)
         neat_path = os.path.join(neat_dir, "NEAT-config.txt")
         
@@ -25,6 +25,7 @@ class NEAT_Spealist():
         self.picklepath = picklepath
         self.logpath = logpath
         self.multiple = mode
+        self.workers = workers
         
         self.neat_execute(neat_path)
         
@@ -38,6 +39,19 @@ class NEAT_Spealist():
         return fitness
 
     def genome_evaluation(self, genomes, config):
+        # networks compiled for the previous generation are dropped as the population turns over
+        if hasattr(self.game.player_controller, 'evict'):
+            self.game.player_controller.evict([x for n_gen, x in genomes])
+
+        if self.workers > 1:
+            # runs all genomes of the generation on the worker processes
+            results = self.game.play_many([x for n_gen, x in genomes], workers=self.workers)
+            for (n_gen, x), (fitness, phealth, ehealth, time) in zip(genomes, results):
+                if self.multiple == 'yes':
+                    fitness = self.game.cons_multi(values=fitness)
+                x.fitness = fitness
+            return
+
         for n_gen, x in genomes:
             x.fitness = 0
             x.fitness = self.game_state(self.game, x)
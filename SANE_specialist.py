@@ -11,6 +11,7 @@ class SANE_Specialist():
         self.neurons_per_network = int(cfg['neurons_per_network'])
         self.n_networks = int(cfg['n_networks'])
         self.mutation_sigma = float(cfg['mutation_sigma'])
+        self.workers = int(cfg.get('workers', 1))
 
         self.n_inputs = env.get_num_sensors()
         self.n_bias = 1
@@ -44,13 +45,23 @@ class SANE_Specialist():
         network_fitnesses = np.zeros(self.n_networks)
         counts = np.zeros(self.total_neurons)
 
+        selects = []
+        nets = []
         for i in range(self.n_networks):
             # Select random neurons to form a network
             select = np.random.choice(self.total_neurons, self.neurons_per_network, replace=False)
             counts[select] += 1
-            net = self.create_network(select)
-            # Evaluate network
-            fitness, _, _, _, = self.env.play(pcont=net)
+            selects.append(select)
+            nets.append(self.create_network(select))
+
+        # Evaluate networks, serially or on the worker processes
+        if self.workers > 1:
+            results = self.env.play_many(nets, workers=self.workers)
+        else:
+            results = [self.env.play(pcont=net) for net in nets]
+
+        for i, (select, net) in enumerate(zip(selects, nets)):
+            fitness, _, _, _, = results[i]
             if self.multiple == 'yes':
                 fitness = self.env.cons_multi(values=fitness)
             network_fitnesses[i] = fitness
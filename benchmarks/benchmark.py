@@ -0,0 +1,235 @@
+####################
+# Benchmarks the speed of the framework: plays fixed-seed episodes against every enemy and reports
+# frames per second, episodes per second, setup time and peak memory of every case as JSON.
+# Every case runs in a fresh process, so its setup time and peak memory are its own.
+
+# Cases (run from any directory):
+#   <controller>-e#          headless, static enemy, single mode, for the random MLP, demo MLP and NEAT controllers
+#   demo-e#-video            drawn on a dummy video driver instead of headless
+#   demo-e#-ai               enemy controlled by a fixed random enemy controller
+#   <controller>-multi       multiple mode against enemies 1-8
+
+# Usage:
+#   python benchmarks/benchmark.py [--episodes N] [--cases demo-e1,neat] [--output results.json]
+#                                  [--compare baseline.json] [--tolerance 0.2]
+# --cases keeps the cases whose name contains any of the given texts. --compare exits with status 1
+# when a case got slower than the baseline by more than the tolerance, or when its results changed.
+####################
+
+import sys, os
+import json
+import time
+import argparse
+import subprocess
+import multiprocessing
+
+# games are never shown, the video cases draw on a dummy display
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"  # keeps the report alone on the standard output
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(root)  # the game loads its maps and images from paths relative to the repository
+sys.path.insert(0, os.path.join(root, 'evoman'))
+sys.path.insert(0, root)
+
+
+# list of the benchmark cases
+def benchmark_cases():
+
+    cases = []
+    for controller in ('random', 'demo', 'neat'):
+        for e in range(1, 9):
+            cases.append(dict(name=controller+'-e'+str(e), controller=controller, enemies=[e]))
+
+    for e in range(1, 9):
+        cases.append(dict(name='demo-e'+str(e)+'-video', controller='demo', enemies=[e], render='screen'))
+
+    for e in range(1, 9):
+        cases.append(dict(name='demo-e'+str(e)+'-ai', controller='demo', enemies=[e], enemymode='ai'))
+
+    for controller in ('random', 'demo'):
+        cases.append(dict(name=controller+'-multi', controller=controller, enemies=[1,2,3,4,5,6,7,8], multiplemode='yes'))
+
+    for case in cases:
+        case.setdefault('render', 'none')
+        case.setdefault('enemymode', 'static')
+        case.setdefault('multiplemode', 'no')
+
+    return cases
+
+
+# player controller and solution of a case, always the same ones
+def player_solution(case):
+
+    import numpy as np
+    from demo_controller import player_controller
+
+    if case['controller'] == 'demo':
+        if case['multiplemode'] == 'yes':
+            return player_controller(0), np.loadtxt('solutions_demo/demo_all.txt')
+        return player_controller(0), np.loadtxt('solutions_demo/demo_'+str(case['enemies'][0])+'.txt')
+
+    if case['controller'] == 'random':
+        n_hidden = 10
+        rng = np.random.default_rng(0)
+        return player_controller(n_hidden), rng.uniform(-1, 1, (20+1)*n_hidden + (n_hidden+1)*5)
+
+    import random
+    import neat
+    from NEAT_controller import NeatController
+
+    controller = NeatController("NEAT-Config.txt")
+    random.seed(0)  # neat draws the initial genome from python's generator
+    genome = neat.DefaultGenome(0)
+    genome.configure_new(controller.config.genome_config)
+    return controller, genome
+
+
+# plays the episodes of a case, returning its measures
+def run_case(case, episodes):
+
+    start = time.perf_counter()
+
+    import numpy as np
+    from environment import Environment
+    from demo_controller import enemy_controller
+
+    pcontroller, pcont = player_solution(case)
+
+    params = {}
+    econt = "None"
+    if case['enemymode'] == 'ai':
+        params['enemy_controller'] = enemy_controller(0)
+        econt = np.random.default_rng(1).uniform(-1, 1, 5 + 20*5)
+
+    env = Environment(experiment_name='benchmarks',
+                      enemies=case['enemies'],
+                      multiplemode=case['multiplemode'],
+                      enemymode=case['enemymode'],
+                      playermode="ai",
+                      player_controller=pcontroller,
+                      level=2,
+                      speed="fastest",
+                      logs="off",
+                      savelogs="no",
+                      render=case['render'],
+                      **params)
+
+    # counts the frames of every run, multiple mode only returns consolidated results
+    frames = [0]
+    return_run = env.return_run
+    def counted(fitness):
+        frames[0] += env.time
+        return return_run(fitness)
+    env.return_run = counted
+
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fitness = []
+    for seed in range(episodes):
+        fitness.append(float(env.play(pcont, econt, seed)[0]))
+    seconds = time.perf_counter() - start
+
+    return dict(case,
+                episodes=episodes,
+                frames=frames[0],
+                seconds=round(seconds, 4),
+                fps=round(frames[0] / seconds, 1),
+                episodes_per_second=round(episodes / seconds, 3),
+                setup_seconds=round(setup, 4),
+                peak_rss_mb=peak_rss_mb(),
+                fitness=fitness)
+
+
+# peak resident memory of this process in megabytes, None where it can not be known
+def peak_rss_mb():
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':  # bytes on macos, kilobytes elsewhere
+        peak /= 1024.
+    return round(peak / 1024., 1)
+
+
+# commit of the benchmarked tree, None outside a git checkout
+def git_commit():
+
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=root, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# compares a report with a baseline one, returning the problems found
+def compare(report, baseline, tolerance):
+
+    problems = []
+    base = dict((case['name'], case) for case in baseline['cases'])
+    for case in report['cases']:
+        old = base.get(case['name'])
+        if old is None:
+            continue
+        if case['fps'] < old['fps'] * (1 - tolerance):
+            problems.append("%s: %.1f fps, was %.1f" % (case['name'], case['fps'], old['fps']))
+        if old['episodes'] == case['episodes'] and old['fitness'] != case['fitness']:
+            problems.append("%s: fitness %s, was %s" % (case['name'], case['fitness'], old['fitness']))
+    return problems
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmarks frames and episodes per second of the game.")
+    parser.add_argument('--episodes', type=int, default=3, help="episodes played by every case, with seeds 0, 1, ...")
+    parser.add_argument('--cases', default='', help="comma separated texts, keeps the cases whose name contains one of them")
+    parser.add_argument('--output', help="file where the JSON report is written, printed when not given")
+    parser.add_argument('--compare', help="JSON report of a previous run to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="fraction of the fps that may be lost before a case counts as a regression")
+    args = parser.parse_args()
+
+    cases = benchmark_cases()
+    if args.cases:
+        keep = args.cases.split(',')
+        cases = [case for case in cases if any(k in case['name'] for k in keep)]
+
+    import numpy
+    import pygame
+
+    report = dict(commit=git_commit(), python=sys.version.split()[0], numpy=numpy.__version__,
+                  pygame=pygame.version.ver, cases=[])
+
+    # a new process for every case, so imports, caches and memory are not shared between cases
+    context = multiprocessing.get_context('spawn')
+    for case in cases:
+        pool = context.Pool(1)
+        result = pool.apply(run_case, (case, args.episodes))
+        pool.close()
+        pool.join()
+
+        report['cases'].append(result)
+        sys.stderr.write("%-16s %10.1f fps %8.3f episodes/s %7.3f s setup %8.1f MB\n" % (
+            result['name'], result['fps'], result['episodes_per_second'], result['setup_seconds'], result['peak_rss_mb'] or 0))
+
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for problem in problems:
+            sys.stderr.write("REGRESSION: " + problem + "\n")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -20,7 +20,8 @@ class player_controller(Controller):
 
 	def control(self, inputs, controller):
 		# Normalises the input using min-max scaling
-		inputs = (inputs-min(inputs))/float((max(inputs)-min(inputs)))
+		inputs_min = inputs.min()
+		inputs = (inputs-inputs_min)/float(inputs.max()-inputs_min)
 
 		if self.n_hidden[0]>0:
 			# Preparing the weights and biases from the controller of layer 1
@@ -74,6 +75,45 @@ class player_controller(Controller):
 
 		return [left, right, jump, shoot, release]
 
+	# Unpacks a (N, n_params) matrix of genomes into stacked weight tensors, one slice per genome
+	def unpack_batch(self, controllers, n_inputs):
+		controllers = np.asarray(controllers, dtype=float)
+		n = len(controllers)
+
+		if self.n_hidden[0]>0:
+			weights1_slice = n_inputs*self.n_hidden[0] + self.n_hidden[0]
+			bias1 = controllers[:, :self.n_hidden[0]].reshape(n, 1, self.n_hidden[0])
+			weights1 = controllers[:, self.n_hidden[0]:weights1_slice].reshape(n, n_inputs, self.n_hidden[0])
+			bias2 = controllers[:, weights1_slice:weights1_slice + 5].reshape(n, 1, 5)
+			weights2 = controllers[:, weights1_slice + 5:].reshape(n, self.n_hidden[0], 5)
+			return bias1, weights1, bias2, weights2
+		else:
+			bias = controllers[:, :5].reshape(n, 1, 5)
+			weights = controllers[:, 5:].reshape(n, n_inputs, 5)
+			return bias, weights
+
+	# Decides the actions of a whole population at once: inputs is (N, n_inputs), controllers is the
+	# (N, n_params) matrix of genomes and the result is a (N, 5) array of actions.
+	# Genomes are unpacked on every call (into reshaped views, cheap to build), so changes to them are always seen.
+	def control_batch(self, inputs, controllers):
+		weights = self.unpack_batch(controllers, inputs.shape[1])
+
+		# Normalises each row of inputs using min-max scaling
+		inputs_min = inputs.min(axis=1, keepdims=True)
+		inputs = (inputs-inputs_min)/(inputs.max(axis=1, keepdims=True)-inputs_min)
+		inputs = inputs[:, np.newaxis, :]
+
+		if self.n_hidden[0]>0:
+			bias1, weights1, bias2, weights2 = weights
+			output1 = sigmoid_activation(np.matmul(inputs, weights1) + bias1)
+			output = sigmoid_activation(np.matmul(output1, weights2) + bias2)[:, 0]
+		else:
+			bias, weights = weights
+			output = sigmoid_activation(np.matmul(inputs, weights) + bias)[:, 0]
+
+		# takes decisions about sprite actions: left, right, jump, shoot, release
+		return (output > 0.5).astype(int)
+
 
 # implements controller structure for enemy
 class enemy_controller(Controller):
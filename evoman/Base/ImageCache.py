@@ -0,0 +1,11 @@
+import pygame
+
+# images already loaded by the sprites of the process, keyed by file name
+images = {}
+
+def loadImage(fileName):
+    """Loads an image file once, later calls return the same (shared) Surface"""
+    image = images.get(fileName)
+    if image is None:
+        image = images[fileName] = pygame.image.load(fileName)
+    return image
@@ -1,17 +1,31 @@
 import pygame
 from . import SpriteConstants
+from .ImageCache import loadImage
 
 class SpriteDefinition(object):
     """Contains the properties and methods to control a SpriteSheet structure"""
 
+    # decoded sheets and their frames, shared by all sprites of the process
+    sheets = {}
+
     def __init__(self, fileName, origin_X, origin_Y, width, height):
-        self.SpriteSheet = pygame.image.load(fileName).convert()
+        key = (fileName, width, height)
+        if key not in SpriteDefinition.sheets:
+            SpriteDefinition.sheets[key] = (loadImage(fileName).convert(), {})
+
+        self.SpriteSheet, self.frames = SpriteDefinition.sheets[key]
         self.Origin_X = origin_X
         self.Origin_Y = origin_Y
         self.Width = width
         self.Height = height
 
-    def getImage(self, steps_X, steps_Y):
+        # cuts every (state, direction) frame of the sheet once
+        if not self.frames:
+            for steps_Y in range(self.SpriteSheet.get_height() // self.Height):
+                for steps_X in range(self.SpriteSheet.get_width() // self.Width):
+                    self.frames[steps_X, steps_Y] = self.cutImage(steps_X, steps_Y)
+
+    def cutImage(self, steps_X, steps_Y):
         marginX = self.Width * steps_X
         marginY = self.Height * steps_Y
 
@@ -27,3 +41,11 @@ class SpriteDefinition(object):
         image.set_colorkey(SpriteConstants.BLACK)
 
         return image
+
+    def getImage(self, steps_X, steps_Y):
+        try:
+            return self.frames[steps_X, steps_Y]
+        except KeyError:
+            # frames outside the sheet grid are cut on demand
+            image = self.frames[steps_X, steps_Y] = self.cutImage(steps_X, steps_Y)
+            return image
@@ -0,0 +1,66 @@
+# bullets shot by the player or an enemy. the bullets on the screen are kept in the order they were
+# shot, and bullets taken off the screen are kept for reuse, so shooting does not create a new sprite
+# once enough bullets have been shot.
+class BulletPool(object):
+
+
+    # capacity: number of bullets of each kind kept for reuse
+    def __init__(self, capacity=32):
+
+        self.capacity = capacity
+        self.bullets = []   # bullets on the screen, in shooting order
+        self.spare = {}   # bullets off the screen, by class
+
+
+    # shoots a bullet of the class, built with the given arguments (as the constructor of the class takes them)
+    def shoot(self, cls, *args):
+
+        spare = self.spare.get(cls)
+        if spare:
+            bullet = spare.pop()
+            vars(bullet).clear()   # a reused bullet starts as a new one
+            bullet.__init__(*args)
+        else:
+            bullet = cls(*args)
+
+        self.bullets.append(bullet)
+        return bullet
+
+
+    # takes a bullet off the screen, keeping it for reuse
+    def remove(self, bullet):
+
+        self.bullets.remove(bullet)
+        self.keep(bullet)
+
+
+    def keep(self, bullet):
+
+        spare = self.spare.setdefault(type(bullet), [])
+        if len(spare) < self.capacity:
+            spare.append(bullet)
+
+
+    def __len__(self):
+        return len(self.bullets)
+
+    def __iter__(self):
+        return iter(self.bullets)
+
+
+    # bullets on the screen, as saved in the state of a game
+    def copy(self):
+        return list(self.bullets)
+
+    # puts back the bullets of a saved state. bullets shot since then are kept for reuse, and the
+    # ones on the screen again can not be reused anymore.
+    def restore(self, bullets):
+
+        on_screen = set(map(id, bullets))
+        for bullet in self.bullets:
+            if id(bullet) not in on_screen:
+                self.keep(bullet)
+        for spare in self.spare.values():
+            spare[:] = [bullet for bullet in spare if id(bullet) not in on_screen]
+
+        self.bullets[:] = bullets
@@ -8,14 +8,16 @@ import numpy
 
 class Controller(object):
 
+    # random numbers source, the environment sets it to the generator of the running episode
+    rng = numpy.random
 
     def control(self, params, cont = None):
 
-        action1 = numpy.random.choice([1,0])
-        action2 = numpy.random.choice([1,0])
-        action3 = numpy.random.choice([1,0])
-        action4 = numpy.random.choice([1,0])
-        action5 = numpy.random.choice([1,0])
-        action6 = numpy.random.choice([1,0])
+        action1 = self.rng.choice([1,0])
+        action2 = self.rng.choice([1,0])
+        action3 = self.rng.choice([1,0])
+        action4 = self.rng.choice([1,0])
+        action5 = self.rng.choice([1,0])
+        action6 = self.rng.choice([1,0])
 
         return [action1, action2, action3, action4, action5, action6]
@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map1.tmx'  # scenario
 timeexpire = 1000 # game run limit
@@ -38,7 +40,7 @@ class Enemy(pygame.sprite.Sprite):
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.hurt = 0
         self.shooting = 1
         self.gun_cooldown = 0
@@ -52,8 +54,8 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
 
         # increments enemy timer
@@ -61,7 +63,7 @@ class Enemy(pygame.sprite.Sprite):
             self.timeenemy += 1
 
         # defines game mode for player action
-        if game.enemymode == 'static': #  controlled by static movements
+        if not game.config.enemy_ai: #  controlled by static movements
 
             atack1 = 1
 
@@ -78,11 +80,11 @@ class Enemy(pygame.sprite.Sprite):
             atack4 = 1
 
 
-        elif game.enemymode == 'ai': # enemy controlled by AI algorithm
+        elif game.config.enemy_ai: # enemy controlled by AI algorithm
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 4:
                 game.print_logs("ERROR: Enemy 1 controller must return 4 decision variables.")
                 sys.exit(0)
@@ -118,7 +120,7 @@ class Enemy(pygame.sprite.Sprite):
                 # chases player, switching direction as he moves.
                 if atack4 == 1:
 
-                    if game.enemymode == 'static':
+                    if not game.config.enemy_ai:
                         if game.player.rect.right < self.rect.left:
                             self.direction = -1
                         elif game.player.rect.left > self.rect.right:
@@ -149,9 +151,9 @@ class Enemy(pygame.sprite.Sprite):
                 # sprite loses life points, according to the difficult level of the game (the more difficult, the more it loses).
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*1))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*1))
 
                 # counts duration of the collision to jump from time to time during the collision
@@ -228,7 +230,7 @@ class Enemy(pygame.sprite.Sprite):
             self.gun_cooldown2 = 6
 
             # Bullets sound effect.
-            if game.sound == "on" and game.playermode == "human":
+            if game.config.sound and game.config.human:
 
                 sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                 c = pygame.mixer.Channel(3)
@@ -247,9 +249,9 @@ class Enemy(pygame.sprite.Sprite):
 
                 # Start position of the bullets vary according to the position of the enemy.
                 if self.direction > 0:
-                    self.twists.append(Bullet_e1((self.rect.x+(i*rand),self.rect.y+10+(i*rand2)), 1, len(self.twists), game.sprite_e))
+                    self.twists.shoot(Bullet_e1, (self.rect.x+(i*rand),self.rect.y+10+(i*rand2)), 1, game.sprite_e)
                 else:
-                    self.twists.append(Bullet_e1((self.rect.x-(i*rand)+46,self.rect.y+10+(i*rand2)), -1, len(self.twists), game.sprite_e))
+                    self.twists.shoot(Bullet_e1, (self.rect.x-(i*rand)+46,self.rect.y+10+(i*rand2)), -1, game.sprite_e)
 
         # Decreases time for bullets and freezing limitation.
         self.gun_cooldown = max(0, self.gun_cooldown - dt)
@@ -282,19 +284,18 @@ class Bullet_e1(pygame.sprite.Sprite):
 
 
 
-    image = pygame.image.load('evoman/images/bullet2_l.png')
+    image = loadImage('evoman/images/bullet2_l.png')
 
-    def __init__(self, location, direction, n_twist, *groups):
+    def __init__(self, location, direction, *groups):
         super(Bullet_e1, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
-        self.n_twist = n_twist
 
         # Fits image according to the side the enemy is turned to.
         if self.direction == 1:
-            self.image = pygame.image.load('evoman/images/bullet2_r.png')
+            self.image = loadImage('evoman/images/bullet2_r.png')
         else:
-            self.image = pygame.image.load('evoman/images/bullet2_l.png')
+            self.image = loadImage('evoman/images/bullet2_l.png')
 
 
 
@@ -303,7 +304,7 @@ class Bullet_e1(pygame.sprite.Sprite):
         # Removes bullets objetcs when they transpass the screem limits.
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # Moving on the X axis.
@@ -317,7 +318,7 @@ class Bullet_e1(pygame.sprite.Sprite):
 
             # Removes the bullet off the screem after collision.
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
 
             # Sets flag to change the player image when he is hurt.
             game.player.hurt = 5
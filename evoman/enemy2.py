@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map2.tmx'
 timeexpire = 1000 # game run limit
@@ -33,7 +35,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
@@ -48,12 +50,12 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([630,610,560,530])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([630,610,560,530])
 
 
         # defines game mode for player action.
-        if game.enemymode == 'static': # enemy controlled by static movements
+        if not game.config.enemy_ai: # enemy controlled by static movements
 
             if (self.timeenemy >= 210  and self.timeenemy <= 250) or (self.timeenemy >= 260  and self.timeenemy <= 300):
                 atack1 = 1
@@ -76,11 +78,11 @@ class Enemy(pygame.sprite.Sprite):
                 atack4 = 0
 
 
-        elif game.enemymode == 'ai': # player controlled by AI algorithm
+        elif game.config.enemy_ai: # player controlled by AI algorithm
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 4:
                 game.print_logs("ERROR: Enemy 1 controller must return 4 decision variables.")
                 sys.exit(0)
@@ -160,9 +162,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*1))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*1))
 
                 game.player.hurt = 5 # sets flag to change the player image when he is hurt.
@@ -200,7 +202,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.gun_cooldown = 3
 
                  # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
@@ -209,7 +211,7 @@ class Enemy(pygame.sprite.Sprite):
 
                 # shoots 6 bullets placed in a fixed range
                 for i in range (0,6):
-                    self.twists.append(Bullet_e2((self.rect.x+10,self.rect.bottom), self.direction ,i, len(self.twists), game.sprite_e))
+                    self.twists.shoot(Bullet_e2, (self.rect.x+10,self.rect.bottom), self.direction ,i, game.sprite_e)
 
             # decreases time for bullets limitation
             self.gun_cooldown = max(0, self.gun_cooldown - dt)
@@ -242,30 +244,29 @@ class Enemy(pygame.sprite.Sprite):
 class Bullet_e2(pygame.sprite.Sprite):
 
 
-    image = pygame.image.load('evoman/images/torna.png')
+    image = loadImage('evoman/images/torna.png')
 
-    def __init__(self, location, direction,n, n_twist , *groups):
+    def __init__(self, location, direction,n, *groups):
         super(Bullet_e2, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.lifespan = 55
         self.n = n
-        self.n_twist = n_twist
 
 
 
     def update(self, dt, game):
 
         if game.time%2==0:
-            self.image = pygame.image.load('evoman/images/torna.png')
+            self.image = loadImage('evoman/images/torna.png')
         else:
-            self.image = pygame.image.load('evoman/images/torna2.png')
+            self.image = loadImage('evoman/images/torna2.png')
 
 
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # enemy atack: blows the player forward with the bullets
@@ -306,10 +307,7 @@ class Bullet_e2(pygame.sprite.Sprite):
             game.player.hurt = 5
 
         # removes player's bullets when colliding with enemy's bullets
-        aux = 0
-        for t in game.player.twists:
-            if t != None:
-                if self.rect.colliderect(t.rect):
-                    t.kill()
-                    game.player.twists[aux] = None
-            aux += 1
+        for t in list(game.player.twists):
+            if self.rect.colliderect(t.rect):
+                t.kill()
+                game.player.twists.remove(t)
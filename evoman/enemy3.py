@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map2.tmx'
 timeexpire = 1000 # game run limit
@@ -31,7 +33,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
@@ -45,11 +47,11 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
         # defines game mode for player action
-        if game.enemymode == 'static': # enemy controlled by static movements
+        if not game.config.enemy_ai: # enemy controlled by static movements
 
             if self.timeenemy >= 120  and self.timeenemy <= 140:
                 atack1 = 1
@@ -72,11 +74,11 @@ class Enemy(pygame.sprite.Sprite):
                 atack4 = 0
 
 
-        elif game.enemymode == 'ai': # player controlled by AI algorithm
+        elif game.config.enemy_ai: # player controlled by AI algorithm
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 4:
                 game.print_logs("ERROR: Enemy 1 controller must return 4 decision variables.")
                 sys.exit(0)
@@ -147,7 +149,7 @@ class Enemy(pygame.sprite.Sprite):
             if atack3 == 1:
                 self.timeenemy = 20
                 # puts the enemy turned to the player's direction
-                if game.enemymode == 'static':
+                if not game.config.enemy_ai:
                     if game.player.rect.right < self.rect.left:
                         self.direction = -1
                     elif game.player.rect.left > self.rect.right:
@@ -159,9 +161,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*1))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*1))
 
                 # pushes player when he collides with the enemy
@@ -209,7 +211,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.gun_cooldown = 3
 
                 # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
@@ -222,15 +224,15 @@ class Enemy(pygame.sprite.Sprite):
 
                     if self.direction > 0:
                         ax = [-24,50,1,1]
-                        self.twists.append(Bullet_e3((self.rect.x+ax[i],self.rect.y-ay[i]), 1, 'h', len(self.twists), game.sprite_e))
+                        self.twists.shoot(Bullet_e3, (self.rect.x+ax[i],self.rect.y-ay[i]), 1, 'h', game.sprite_e)
                     else:
                         ax = [25,-50,-7,-7]
-                        self.twists.append(Bullet_e3((self.rect.x-ax[i],self.rect.y-ay[i]), -1, 'h', len(self.twists), game.sprite_e))
+                        self.twists.shoot(Bullet_e3, (self.rect.x-ax[i],self.rect.y-ay[i]), -1, 'h', game.sprite_e)
 
                 # shoots 4 bullets placed in fixed places - bullets coming from the top of the screen
                 aux = 100
                 for i in range (0,4):
-                    self.twists.append(Bullet_e3((aux,100), 1, 'v',len(self.twists),game.sprite_e))
+                    self.twists.shoot(Bullet_e3, (aux,100), 1, 'v', game.sprite_e)
                     aux = aux + 150
 
             # decreases time for bullets limitation
@@ -264,16 +266,15 @@ class Bullet_e3(pygame.sprite.Sprite):
 
 
 
-    image = pygame.image.load('evoman/images/met.png')
+    image = loadImage('evoman/images/met.png')
 
-    def __init__(self, location, direction, btype, n_twist, *groups):
+    def __init__(self, location, direction, btype, *groups):
         super(Bullet_e3, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.lifespan = 100
         self.btype = btype
         self.swingtime = 0
-        self.n_twist = n_twist
 
 
 
@@ -281,9 +282,9 @@ class Bullet_e3(pygame.sprite.Sprite):
 
 
         if game.time%2==0:
-            self.image = pygame.image.load('evoman/images/met.png')
+            self.image = loadImage('evoman/images/met.png')
         else:
-            self.image = pygame.image.load('evoman/images/met2.png')
+            self.image = loadImage('evoman/images/met2.png')
 
 
         # decreases bullet's timer
@@ -292,7 +293,7 @@ class Bullet_e3(pygame.sprite.Sprite):
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # moves the bullets
@@ -330,10 +331,7 @@ class Bullet_e3(pygame.sprite.Sprite):
             game.player.hurt = 5
 
         # removes player's bullets when colliding with enemy's bullets
-        aux = 0
-        for t in game.player.twists:
-            if t != None:
-                if self.rect.colliderect(t.rect):
-                    t.kill()
-                    game.player.twists[aux] = None
-            aux += 1
+        for t in list(game.player.twists):
+            if self.rect.colliderect(t.rect):
+                t.kill()
+                game.player.twists.remove(t)
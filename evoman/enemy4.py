@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map2.tmx'
 timeexpire = 1500 # game run limit
@@ -32,7 +34,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.alternate = 1
         self.fireflash = 0
         self.imune = 0
@@ -49,12 +51,12 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
 
         # defines game mode for player action
-        if game.enemymode == 'static': # enemy controlled by static movements
+        if not game.config.enemy_ai: # enemy controlled by static movements
 
             if self.timeenemy == 2:
                 atack1 = 1
@@ -76,11 +78,11 @@ class Enemy(pygame.sprite.Sprite):
             else:
                 atack4 = 0
 
-        elif game.enemymode == 'ai': # player controlled by AI algorithm
+        elif game.config.enemy_ai: # player controlled by AI algorithm
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 4:
                 game.print_logs("ERROR: Enemy 1 controller must return 4 decision variables.")
                 sys.exit(0)
@@ -139,7 +141,7 @@ class Enemy(pygame.sprite.Sprite):
             if atack2 == 1:
                 self.timeenemy = 1
 
-                if game.enemymode == 'static':
+                if not game.config.enemy_ai:
                     if game.player.rect.right < self.rect.left:
                         self.direction = -1
                     elif game.player.rect.left > self.rect.right:
@@ -152,9 +154,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*0.3))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*0.3))
 
                 # pushes player when he collides with the enemy
@@ -206,7 +208,7 @@ class Enemy(pygame.sprite.Sprite):
                 if self.fireflash == 0:
 
                     # bullets sound effect
-                    if game.sound == "on" and game.playermode == "human":
+                    if game.config.sound and game.config.human:
                         sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                         c = pygame.mixer.Channel(3)
                         c.set_volume(10)
@@ -214,7 +216,7 @@ class Enemy(pygame.sprite.Sprite):
 
 
                     for i in range (0,3):
-                        self.twists.append(Bullet_e4((self.rect.x ,self.rect.y ), self.direction, i, len(self.twists), game.sprite_e))
+                        self.twists.shoot(Bullet_e4, (self.rect.x ,self.rect.y ), self.direction, i, game.sprite_e)
                 else :
                     self.timeenemy -= 1
 
@@ -234,9 +236,9 @@ class Enemy(pygame.sprite.Sprite):
             #  changes the image when enemy is hurt and imune, as a fireball
             if self.imune == 1:
                 if game.time%2==0:
-                    self.image = pygame.image.load('evoman/images/fireball.png')
+                    self.image = loadImage('evoman/images/fireball.png')
                 else:
-                    self.image = pygame.image.load('evoman/images/fireball2.png')
+                    self.image = loadImage('evoman/images/fireball2.png')
 
             self.hurt -=1
 
@@ -247,15 +249,14 @@ class Enemy(pygame.sprite.Sprite):
 # enemy bullets
 class Bullet_e4(pygame.sprite.Sprite):
 
-    image = pygame.image.load('evoman/images/bullet_l.png')
+    image = loadImage('evoman/images/bullet_l.png')
 
-    def __init__(self, location, direction, n, n_twist, *groups):
+    def __init__(self, location, direction, n, *groups):
         super(Bullet_e4, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.lifespan = 30
         self.n= n
-        self.n_twist = n_twist
 
     def update(self, dt, game):
 
@@ -300,12 +301,12 @@ class Bullet_e4(pygame.sprite.Sprite):
 
         if self.lifespan < 0:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         if self.rect.right<1 or self.rect.left>736 or  self.rect.top <1 or self.rect.bottom>512 :
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # checks collision of enemy's bullet with the player
@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map2.tmx'
 timeexpire = 1000 # game run limit
@@ -40,7 +42,7 @@ class Enemy(pygame.sprite.Sprite):
         self.countmove = 0
         self.rect.x = 500
         self.timeenemy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.hurt = 0
         self.shooting = 0
         self.gun_cooldown = 0
@@ -52,11 +54,11 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
         # Defines game mode for player action.
-        if game.enemymode == 'static': # Enemy controlled by static movements.
+        if not game.config.enemy_ai: # Enemy controlled by static movements.
 
             if self.resting == 1 and self.timeenemy >= 95 and self.timeenemy <= 110:
                 atack1 = 1
@@ -74,12 +76,12 @@ class Enemy(pygame.sprite.Sprite):
                 atack3 = 0
 
 
-        elif game.enemymode == 'ai': # Player controlled by AI algorithm.
+        elif game.config.enemy_ai: # Player controlled by AI algorithm.
 
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 3:
                 game.print_logs("ERROR: Enemy 1 controller must return 3 decision variables.")
                 sys.exit(0)
@@ -154,28 +156,28 @@ class Enemy(pygame.sprite.Sprite):
                 self.gun_cooldown = 3
 
                 # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
                     c.play(sound)
 
-                aux = numpy.random.randint(1,4)
+                aux = game.rng.integers(1,4)
                 for i in range(0,aux):
-                    self.twists.append(Bullet_e5((self.rect.x + (self.direction*(i*30)) ,self.rect.top + (self.direction*(i*20))  ), self.direction, game.player.rect , len(self.twists), game.sprite_e))
+                    self.twists.shoot(Bullet_e5, (self.rect.x + (self.direction*(i*30)) ,self.rect.top + (self.direction*(i*20))  ), self.direction, game.player.rect , game.sprite_e)
 
 
                 self.timeenemy = 0 # reinicializes enemy timer
 
             if game.player.atacked == 1:
                 # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
                     c.play(sound)
 
-                self.twists.append(Bullet_e5((self.rect.x ,self.rect.top ), self.direction, game.player.rect , len(self.twists), game.sprite_e))
+                self.twists.shoot(Bullet_e5, (self.rect.x ,self.rect.top ), self.direction, game.player.rect , game.sprite_e)
 
 
             self.gun_cooldown = max(0, self.gun_cooldown - dt)   # decreases time for bullets limitation
@@ -208,9 +210,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*0.3))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*0.3))
 
                 # pushes player when he collides with the enemy
@@ -274,14 +276,13 @@ class Bullet_e5(pygame.sprite.Sprite):
 
 
 
-    image = pygame.image.load('evoman/images/blade.png')
+    image = loadImage('evoman/images/blade.png')
 
-    def __init__(self, location, direction, pos_p, n_twist, *groups):
+    def __init__(self, location, direction, pos_p, *groups):
         super(Bullet_e5, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.pos_p = pos_p
-        self.n_twist = n_twist
 
 
     def update(self, dt, game):
@@ -295,7 +296,7 @@ class Bullet_e5(pygame.sprite.Sprite):
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # checks collision of enemy's bullet with the player
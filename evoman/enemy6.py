@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map2.tmx'
 timeexpire = 2200 # game run limit
@@ -33,7 +35,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.alternate = 1
         self.just_shoot = 0
         self.imune = 0
@@ -49,12 +51,12 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
 
         # Defines game mode for player action.
-        if game.enemymode == 'static': # Enemy controlled by static movements.
+        if not game.config.enemy_ai: # Enemy controlled by static movements.
 
             if self.timeenemy == 105:
                 atack1 = 1
@@ -70,11 +72,11 @@ class Enemy(pygame.sprite.Sprite):
             atack3 = 0
 
 
-        elif game.enemymode == 'ai': # Player controlled by AI algorithm.
+        elif game.config.enemy_ai: # Player controlled by AI algorithm.
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 3:
                 game.print_logs("ERROR: Enemy 1 controller must return 3 decision variables.")
                 sys.exit(0)
@@ -119,7 +121,7 @@ class Enemy(pygame.sprite.Sprite):
             #  jumps over the player. It happens from time to time, or when the player shoots.
             if ((self.resting == 1 and atack1 == 1) or ( self.resting == 1 and game.player.atacked == 1)):
 
-                if game.enemymode == 'static':
+                if not game.config.enemy_ai:
                     # enemy turns to the players direction.
                     if game.player.rect.right <= self.rect.left:
                         self.direction = -1
@@ -132,7 +134,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.dy = -1500 * aux_dist
                 self.resting = 0
 
-            if atack3 == 1 and game.enemymode == 'ai':
+            if atack3 == 1 and game.config.enemy_ai:
                  self.direction = self.direction * -1
 
             # throws a bullet over the player when enemy is jumping and right over him
@@ -142,7 +144,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.gun_cooldown = 3
 
                 # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
@@ -150,7 +152,7 @@ class Enemy(pygame.sprite.Sprite):
 
                 self.just_shoot = 1
 
-                self.twists.append(Bullet_e6((self.rect.x ,self.rect.y ), self.direction, len(self.twists), game.sprite_e))
+                self.twists.shoot(Bullet_e6, (self.rect.x ,self.rect.y ), self.direction, game.sprite_e)
 
 
             self.gun_cooldown = max(0, self.gun_cooldown - dt) # decreases time for bullets limitation
@@ -183,9 +185,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*0.3))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*0.3))
 
                 game.player.rect.x +=  self.direction *  50 * dt   # pushes player when he collides with the enemy
@@ -252,14 +254,13 @@ class Bullet_e6(pygame.sprite.Sprite):
 
 
 
-    image = pygame.image.load('evoman/images/mi2.png')
+    image = loadImage('evoman/images/mi2.png')
 
-    def __init__(self, location, direction, n_twist, *groups):
+    def __init__(self, location, direction, *groups):
         super(Bullet_e6, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.lifespan = 70
-        self.n_twist = n_twist
 
 
     def update(self, dt, game):
@@ -274,7 +275,7 @@ class Bullet_e6(pygame.sprite.Sprite):
         # removes old bullets
         if self.lifespan < 0:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # checks collision of enemy's bullet with the player
@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map4.tmx'
 timeexpire = 1000 # game run limit
@@ -34,7 +36,7 @@ class Enemy(pygame.sprite.Sprite):
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.bullets = 0
         self.hurt = 0
         self.shooting = 0
@@ -47,12 +49,12 @@ class Enemy(pygame.sprite.Sprite):
 
         if game.time==1:
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
 
         # defines game mode for player actionv
-        if game.enemymode == 'static': # enemy controlled by static movements
+        if not game.config.enemy_ai: # enemy controlled by static movements
 
             if self.timeenemy>=4 and self.timeenemy<=20 and  self.timeenemy%4 == 0:
                 atack1 = 1
@@ -89,12 +91,12 @@ class Enemy(pygame.sprite.Sprite):
                 atack6 = 0
 
 
-        elif game.enemymode == 'ai': # Player controlled by AI algorithm.
+        elif game.config.enemy_ai: # Player controlled by AI algorithm.
 
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)  
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)  
             if len(actions) < 6:
                 game.print_logs("ERROR: Enemy 1 controller must return 6 decision variables.")
                 sys.exit(0)
@@ -143,14 +145,14 @@ class Enemy(pygame.sprite.Sprite):
 
 
                 # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
                     c.play(sound)
 
-                rand = numpy.random.randint(0, 25, 1)
-                self.twists.append(Bullet_e7((self.rect.x,self.rect.y), self.direction, len(self.twists), game.sprite_e))
+                rand = game.rng.integers(0, 25, 1)
+                self.twists.shoot(Bullet_e7, (self.rect.x,self.rect.y), self.direction, game.sprite_e)
 
 
             # throws from 1 to 3 bubbles, starting at slighly different positions
@@ -164,7 +166,7 @@ class Enemy(pygame.sprite.Sprite):
                         self.gun_cooldown = 3
 
                         self.bullets += 1
-                        self.twists.append(Bullet_e72((self.rect.x+self.direction*i*30  ,self.rect.y-i*30), self.direction, len(self.twists), game.sprite_e))
+                        self.twists.shoot(Bullet_e72, (self.rect.x+self.direction*i*30  ,self.rect.y-i*30), self.direction, game.sprite_e)
 
             # decreases time for bullets limitation
             self.gun_cooldown = max(0, self.gun_cooldown - dt)
@@ -183,7 +185,7 @@ class Enemy(pygame.sprite.Sprite):
 
             # at the end of the atack cicle, enemy turns over the players direction.
             if atack6 == 1:
-               if game.enemymode == 'static':
+               if not game.config.enemy_ai:
                    if game.player.rect.right < self.rect.left:
                        self.direction = -1
                    if game.player.rect.left > self.rect.right:
@@ -214,9 +216,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*0.3))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*0.3))
 
 
@@ -283,13 +285,12 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e7(pygame.sprite.Sprite):
 
-    image = pygame.image.load('evoman/images/bullet2_l.png')
+    image = loadImage('evoman/images/bullet2_l.png')
 
-    def __init__(self, location, direction, n_twist, *groups):
+    def __init__(self, location, direction, *groups):
         super(Bullet_e7, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
-        self.n_twist = n_twist
 
 
 
@@ -301,7 +302,7 @@ class Bullet_e7(pygame.sprite.Sprite):
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # checks collision of enemy's bullet with the player
@@ -329,14 +330,13 @@ class Bullet_e7(pygame.sprite.Sprite):
 # enemy's bullet 2 (bubble)
 class Bullet_e72(pygame.sprite.Sprite):
 
-    image = pygame.image.load('evoman/images/bubb.png')
+    image = loadImage('evoman/images/bubb.png')
 
-    def __init__(self, location, direction, n_twist, *groups):
+    def __init__(self, location, direction, *groups):
         super(Bullet_e72, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.direc = 1
-        self.n_twist = n_twist
 
 
 
@@ -353,7 +353,7 @@ class Bullet_e72(pygame.sprite.Sprite):
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             game.enemy.bullets -=1
             return
 
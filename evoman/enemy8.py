@@ -11,7 +11,9 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import Sensors
+from bullet_pool import BulletPool
 
 tilemap = 'evoman/map3.tmx'
 timeexpire = 1000 # game run limit
@@ -35,7 +37,7 @@ class Enemy(pygame.sprite.Sprite):
         self.just_shoot = 0
         self.imune = 0
         self.timeenemy = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.hurt = 0
         self.shooting = 0
         self.gun_cooldown = 0
@@ -47,11 +49,11 @@ class Enemy(pygame.sprite.Sprite):
         if game.time==1:
 
             # puts enemy in random initial position
-            if game.randomini == 'yes':
-                self.rect.x = numpy.random.choice([640,500,400,300])
+            if game.config.random_ini:
+                self.rect.x = game.rng.choice([640,500,400,300])
 
         # defines game mode for player action
-        if game.enemymode == 'static': # enemy controlled by static movements
+        if not game.config.enemy_ai: # enemy controlled by static movements
 
             if (self.timeenemy >= 1 and self.timeenemy <10)  or (self.timeenemy >= 20 and self.timeenemy <30):
                 atack1 = 1
@@ -85,12 +87,12 @@ class Enemy(pygame.sprite.Sprite):
 
 
 
-        elif game.enemymode == 'ai': # player controlled by AI algorithm
+        elif game.config.enemy_ai: # player controlled by AI algorithm
 
 
 
             # calls the controller providing game sensors
-            actions = game.enemy_controller.control(self.sensors.get(game), game.econt)
+            actions = game.enemy_controller.control(self.sensors.read(game), game.econt)
             if len(actions) < 6:
                 game.print_logs("ERROR: Enemy 1 controller must return 6 decision variables.")
                 sys.exit(0)
@@ -128,7 +130,7 @@ class Enemy(pygame.sprite.Sprite):
                 # enemy turns to the players direction
                 if atack3 == 1:
 
-                    if game.enemymode == 'static':
+                    if not game.config.enemy_ai:
                         if game.player.rect.right < self.rect.left:
                             self.direction = -1
                         if game.player.rect.left > self.rect.right:
@@ -152,7 +154,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.gun_cooldown = 5
 
                 # bullets sound effect
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi011.wav')
                     c = pygame.mixer.Channel(3)
                     c.set_volume(10)
@@ -163,7 +165,7 @@ class Enemy(pygame.sprite.Sprite):
                 rand = 3
                 # shoots from 1 to 3 bullets
                 for i in range(0,rand):
-                    self.twists.append(Bullet_e8((self.rect.x+(i*60) ,self.rect.y ), i, self.direction, len(self.twists), game.sprite_e))
+                    self.twists.shoot(Bullet_e8, (self.rect.x+(i*60) ,self.rect.y ), i, self.direction, game.sprite_e)
 
             # decreases time for bullets limitation
             self.gun_cooldown = max(0, self.gun_cooldown - dt)
@@ -196,9 +198,9 @@ class Enemy(pygame.sprite.Sprite):
             if self.rect.colliderect(game.player.rect):
 
                 # choses what sprite penalise according to config
-                if game.contacthurt == "player":
+                if game.config.hurt_player:
                     game.player.life = max(0, game.player.life-(game.level*0.3))
-                if game.contacthurt == "enemy":
+                if not game.config.hurt_player:
                     game.enemy.life = max(0, game.enemy.life-(game.level*0.3))
 
                 # sets flag to change the player image when he is hurt
@@ -257,15 +259,14 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e8(pygame.sprite.Sprite):
 
-    image = pygame.image.load('evoman/images/bullet2_l.png')
+    image = loadImage('evoman/images/bullet2_l.png')
 
-    def __init__(self, location, direction, n, n_twist, *groups):
+    def __init__(self, location, direction, n, *groups):
         super(Bullet_e8, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
         self.lifespan = 70
         self.n = n
-        self.n_twist = n_twist
 
 
 
@@ -293,7 +294,7 @@ class Bullet_e8(pygame.sprite.Sprite):
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right < 1 or self.rect.left>736 or self.rect.bottom < 1  or self.rect.top > 512:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.remove(self)
             return
 
         # checks collision of enemy's bullet with the player
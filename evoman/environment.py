@@ -5,21 +5,117 @@
 ################################
 
 import sys
+import os
+import signal
+import time
 import gzip
 import pickle
+import multiprocessing
 import numpy
 import pygame
 from pygame.locals import *
 import struct
 import tmx
+import log_writer
 
 from player import *
+from bullet_pool import BulletPool
 from controller import Controller
 
 
+# parsed tilemaps of this process with the start cells of enemy and player, keyed by map file and viewport
+_tilemaps = {}
+
+# wraps a function so that its calls are timed as a phase of the game loop
+def _profiled(env, phase, function):
+    def profiled(*args, **kwargs):
+        env.enter(phase)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            env.leave()
+    return profiled
+
+# attributes of a sprite, along with the contents of its rects and containers. restoring a state
+# puts the same objects back and refills them in place, so objects shared between sprites (e.g. a
+# bullet aiming at the player rect) stay shared. group memberships are left out, they are rebuilt
+# by adding the sprite to its groups again.
+def _sprite_state(sprite):
+    attrs = dict((k, v) for k, v in vars(sprite).items() if k != '_Sprite__g')
+    contents = dict((k, tuple(v) if isinstance(v, pygame.Rect) else v.copy())
+                    for k, v in attrs.items() if isinstance(v, (pygame.Rect, list, dict, BulletPool)))
+    return attrs, contents
+
+# sets the attributes of a sprite back to a state, dropping the attributes set after it
+def _restore_sprite(sprite, state):
+    attrs, contents = state
+    current = vars(sprite)
+    if len(current) != len(attrs) + 1:
+        for k in list(current):
+            if k not in attrs and k != '_Sprite__g':
+                del current[k]
+    current.update(attrs)
+    for k, content in contents.items():
+        value = attrs[k]
+        if isinstance(value, pygame.Rect):
+            value.update(content)
+        elif isinstance(value, list):
+            value[:] = content
+        elif isinstance(value, BulletPool):
+            value.restore(content)
+        else:
+            value.clear()
+            value.update(content)
+
+
+# environment attributes making the state of a run, besides its sprites
+_run_attrs = ('enemyn', 'enemy_module', 'tilemap', 'sprite_e', 'sprite_p', 'player', 'enemy', 'sprites_key',
+              'sprites_state', 'pcont', 'econt', 'time', 'freeze_p', 'freeze_e', 'start', 'ends',
+              'episode_seed', 'rng', 'prune_below', 'pruned', 'step_result', 'step_fitness', 'player_actions')
+
+
+# options of an environment as the flags read by the game loop and the sprites at every frame.
+# built once the parameters have been validated and never changed: a parameter change builds a new one.
+class Config(object):
+
+    __slots__ = ('human', 'enemy_ai', 'load_player', 'load_enemy', 'inputs_coded', 'random_ini',
+                 'sound', 'hurt_player', 'fastest', 'busy_clock', 'profile', 'draws')
+
+    def __init__(self, env):
+        values = {'human': env.playermode == "human",
+                  'enemy_ai': env.enemymode == "ai",
+                  'load_player': env.loadplayer == "yes",
+                  'load_enemy': env.loadenemy == "yes",
+                  'inputs_coded': env.inputscoded == "yes",
+                  'random_ini': env.randomini == "yes",
+                  'sound': env.sound == "on",
+                  'hurt_player': env.contacthurt == "player",   # hurt by contact, the enemy otherwise
+                  'fastest': env.speed == "fastest",
+                  'busy_clock': env.clockprec == "medium",   # medium clock precision
+                  'profile': env.profile == "on",
+                  'draws': env.render == "screen"}   # headless runs skip events polling and any drawing
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("the configuration can not be changed, use Environment.update_parameter")
+
+    def __delattr__(self, name):
+        raise AttributeError("the configuration can not be changed, use Environment.update_parameter")
+
+
 # main class
 class Environment(object):
 
+    # parameters needed for rebuilding an equivalent environment (e.g. in worker processes)
+    params = ('experiment_name', 'multiplemode', 'enemies', 'loadplayer', 'loadenemy', 'level',
+              'playermode', 'enemymode', 'speed', 'inputscoded', 'randomini', 'sound', 'contacthurt',
+              'logs', 'savelogs', 'clockprec', 'timeexpire', 'overturetime', 'solutions', 'fullscreen',
+              'player_controller', 'enemy_controller', 'use_joystick', 'render', 'seed', 'cache', 'action_repeat',
+              'profile')
+
+    # other attributes saved with the parameters, which update_parameter also accepts
+    state_params = ('enemyn',)
 
     # simulation parameters
     def __init__(self,
@@ -45,7 +141,12 @@ class Environment(object):
                  fullscreen=False,            # True or False
                  player_controller=None,      # controller object
                  enemy_controller=None,      # controller object
-                 use_joystick=False):
+                 use_joystick=False,
+                 render="screen",             # screen or none
+                 seed=None,                   # integer or None
+                 cache=None,                  # EvaluationCache or None
+                 action_repeat=1,             # integer
+                 profile="off"):              # on or off
 
 
         # initializes parameters
@@ -73,6 +174,27 @@ class Environment(object):
         self.solutions = solutions
         self.joy = 0
         self.use_joystick = use_joystick
+        self.render = render
+        self.seed = seed   # seed of every episode, if None each episode draws one from numpy's global state
+        self.rng = numpy.random.default_rng(seed)   # random numbers source of the running episode
+        self.episode_seed = seed
+        self.cache = cache   # results of already played runs, looked up by play
+        self.action_repeat = action_repeat   # frames the actions of the ai player last
+        self.profile = profile   # measures the time spent in each phase of the game loop
+        self.timings = {}   # seconds spent in each phase since the last profile report
+        self.profiled_frames = 0   # frames played since the last profile report
+        self.phases = []   # phases being timed, the innermost last (empty when not profiling)
+        self.lap_time = 0   # moment the time of the innermost phase was last added to it
+        self.prune_below = None   # runs stop once their fitness can not reach this value anymore
+        self.pruned = False   # tells if the last run was stopped by prune_below
+        self.step_result = None   # results of the run driven by reset and step, once it has ended
+        self.step_fitness = 0
+        self.sprites_key = None   # enemy and level of the loaded sprites
+        self.sprites_state = None   # initial state of the loaded enemy and player
+        self.player_actions = None   # actions fed to the player instead of asking its controller
+        self.pool = None   # worker processes for play_many
+        self.pool_params = None
+        self.config = None   # validated parameters, built by checks_params before the next run
 
 
         # initializes default random controllers
@@ -89,10 +211,14 @@ class Environment(object):
 
 
         # initializes log file
+        self.logs_worker = None   # worker process whose own file gets the logs, None for the main file
         if self.logs  == "on" and self.savelogs == "yes":
-            file_aux  = open(self.experiment_name+'/evoman_logs.txt','w')
-            file_aux.close()
+            log_writer.writer(self.logs_path()).truncate()
+
 
+        # headless simulation never opens a window, surfaces are only needed for loading sprites
+        if self.render == "none":
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
         # initializes pygame library
         pygame.init()
@@ -126,24 +252,97 @@ class Environment(object):
 
     def load_sprites(self):
 
-        # loads enemy and map
+        # loads enemy and map, parsing each map file only once per process
         enemy = __import__('enemy'+str(self.enemyn))
-        self.tilemap = tmx.load(enemy.tilemap, self.screen.get_size())  # map
+        key = (enemy.tilemap, self.screen.get_size())
+        if key not in _tilemaps:
+            tilemap = tmx.load(enemy.tilemap, self.screen.get_size())
+            triggers = tilemap.layers['triggers']
+            _tilemaps[key] = (tilemap, triggers.find('enemy')[0], triggers.find('player')[0])
+        tilemap, enemy_cell, player_cell = _tilemaps[key]
+        self.tilemap = tilemap.copy()  # map
+
+        # the sprites of the last run are reset in place if they were loaded for the same enemy and level
+        if self.sprites_key == (self.enemyn, self.level):
+            self.reset_sprites()
+            self.tilemap.layers.append(self.sprite_e)
+            self.tilemap.layers.append(self.sprite_p)
+            return
 
         self.sprite_e = tmx.SpriteLayer()
-        start_cell = self.tilemap.layers['triggers'].find('enemy')[0]
+        start_cell = enemy_cell
         self.enemy = enemy.Enemy((start_cell.px, start_cell.py), self.sprite_e)
         self.tilemap.layers.append(self.sprite_e)  # enemy
 
         # loads player
         self.sprite_p = tmx.SpriteLayer()
-        start_cell = self.tilemap.layers['triggers'].find('player')[0]
+        start_cell = player_cell
         self.player = Player((start_cell.px, start_cell.py), self.enemyn, self.level, self.sprite_p)
         self.tilemap.layers.append(self.sprite_p)
 
         self.player.sensors = Sensors()
         self.enemy.sensors = Sensors()
 
+        self.sprites_key = (self.enemyn, self.level)
+        self.sprites_state = (_sprite_state(self.enemy), _sprite_state(self.player))
+
+
+    # captures the state of the running game, to be restored any number of times. sprites are not
+    # copied: the snapshot keeps them along with the values of their attributes.
+    def snapshot(self):
+
+        groups = (self.sprite_e.sprites(), self.sprite_p.sprites())
+        sprites = [(sprite, _sprite_state(sprite)) for sprite in groups[0] + groups[1]]
+        if self.player not in groups[1]:
+            sprites.append((self.player, _sprite_state(self.player)))
+        if self.enemy not in groups[0]:
+            sprites.append((self.enemy, _sprite_state(self.enemy)))
+
+        attrs = dict((name, getattr(self, name)) for name in _run_attrs)
+
+        return attrs, groups, sprites, self.rng.bit_generator.state, self.tilemap._old_focus
+
+
+    # puts the game back in a state captured by snapshot
+    def restore(self, snap):
+
+        attrs, groups, sprites, rng_state, focus = snap
+
+        for name, value in attrs.items():
+            setattr(self, name, value)
+        self.rng.bit_generator.state = rng_state
+        for controller in (self.player_controller, self.enemy_controller):
+            if isinstance(controller, Controller):
+                controller.rng = self.rng
+
+        for sprite, state in sprites:
+            _restore_sprite(sprite, state)
+
+        self.sprite_e.empty()
+        self.sprite_e.add(*groups[0])
+        self.sprite_p.empty()
+        self.sprite_p.add(*groups[1])
+
+        # the view of the map only depends on its focus
+        if focus is None:
+            self.tilemap._old_focus = None
+        else:
+            self.tilemap.set_focus(focus[0], focus[1], force=True)
+
+
+    # removes every bullet and puts enemy and player back in their initial state
+    def reset_sprites(self):
+
+        self.sprite_e.empty()
+        self.sprite_p.empty()
+
+        enemy_state, player_state = self.sprites_state
+        _restore_sprite(self.enemy, enemy_state)
+        _restore_sprite(self.player, player_state)
+
+        self.sprite_e.add(self.enemy)
+        self.sprite_p.add(self.player)
+
 
     # updates environment with backup of current solutions in simulation
     def get_solutions(self):
@@ -158,10 +357,12 @@ class Environment(object):
     # method for updating simulation parameters
     def update_parameter(self, name, value):
 
-        if type(value) is str:
-            exec('self.'+name +"= '"+ value+"'")
-        else:
-            exec('self.'+name +"= "+ str(value))
+        if name not in self.params and name not in self.state_params:
+            self.print_logs("ERROR: '"+str(name)+"' is not a parameter of the environment.")
+            sys.exit(0)
+
+        setattr(self, name, value)
+        self.config = None   # validated again before the next run
 
         self.print_logs("PARAMETER CHANGE: "+name+" = "+str(value))
 
@@ -169,21 +370,88 @@ class Environment(object):
 
     def print_logs(self, msg):
         if self.logs == "on":
+            self.enter('logs')
             print('\n'+msg) # prints log messages to screen
 
-            if self.savelogs == "yes": # prints log messages to file
-                file_aux  = open(self.experiment_name+'/evoman_logs.txt','a')
-                file_aux.write('\n\n'+msg)
-                file_aux.close()
+            if self.savelogs == "yes": # prints log messages to file, written in the background
+                log_writer.writer(self.logs_path()).write('\n\n'+msg)
+            self.leave()
+
+
+    # file of the log messages, worker processes have their own so they never share one
+    def logs_path(self):
+        if self.logs_worker is None:
+            return self.experiment_name+'/evoman_logs.txt'
+        return self.experiment_name+'/evoman_logs_worker'+str(self.logs_worker)+'.txt'
+
+
+    # adds the time passed since the last lap to the innermost phase being timed
+    def lap(self):
+        now = time.perf_counter()
+        phase = self.phases[-1]
+        self.timings[phase] = self.timings.get(phase, 0) + now - self.lap_time
+        self.lap_time = now
+
+    # starts timing a phase of the game loop, pausing the enclosing one
+    def enter(self, phase):
+        if self.phases:
+            self.lap()
+            self.phases.append(phase)
+
+    # stops timing the innermost phase, resuming the enclosing one
+    def leave(self):
+        if self.phases:
+            self.lap()
+            self.phases.pop()
+
+    # updates the sprites of a layer, timing each one as the phase of the player, enemy or bullets
+    def update_profiled(self, layer):
+
+        if not isinstance(layer, tmx.SpriteLayer):
+            self.enter('map')
+            layer.update( 33 / 1000., self)
+            self.leave()
+            return
+
+        for sprite in layer.sprites():
+            if sprite is self.player:
+                self.enter('player')
+            elif sprite is self.enemy:
+                self.enter('enemy')
+            else:
+                self.enter('bullets')
+            sprite.update( 33 / 1000., self)
+            self.leave()
+
+    # prints the time spent in each phase of the game loop since the last report, then starts over.
+    # returns the seconds spent in each phase.
+    def profile_report(self):
+
+        timings = self.timings
+        total = sum(timings.values())
+        if total > 0:
+            msg = "PROFILE: "+str(self.profiled_frames)+" frames in "+str(round(total, 3))+" seconds"
+            for phase in sorted(timings, key=timings.get, reverse=True):
+                msg += "\n  %-10s %9.3f s %6.1f %% %9.1f us/frame" % (phase, timings[phase], 100*timings[phase]/total,
+                                                                     1e6*timings[phase]/max(1, self.profiled_frames))
+            self.print_logs(msg)
+
+        self.timings = {}
+        self.profiled_frames = 0
+        return timings
 
 
     def get_num_sensors(self):
 
+        # sensors read the validated parameters
+        if self.config is None:
+            self.checks_params()
+
         if hasattr(self, 'enemy') and self.enemymode == "ai":
-            return  len(self.enemy.sensors.get(self))
+            return  len(self.enemy.sensors.read(self))
         else:
             if hasattr(self, 'player') and self.playermode == "ai":
-                return len(self.player.sensors.get(self))
+                return len(self.player.sensors.read(self))
             else:
                 return 0
 
@@ -224,6 +492,10 @@ class Environment(object):
         self.print_logs("overture time: "  +str(self.overturetime))
         self.print_logs("logs: "+self.logs)
         self.print_logs("save logs: "+self.savelogs)
+        self.print_logs("render: "+self.render)
+        self.print_logs("seed: "+str(self.seed))
+        self.print_logs("action repeat: "+str(self.action_repeat))
+        self.print_logs("profile: "+self.profile)
         self.print_logs("########## Simulation state - END ###########")
 
 
@@ -254,6 +526,7 @@ class Environment(object):
         file_aux.write("\nsound "  +self.sound)
         file_aux.write("\nlogs "+self.logs)
         file_aux.write("\nsavelogs "+self.savelogs)
+        file_aux.write("\nrender "+self.render)
         file_aux.close()
 
         # saves state of solutions in the simulation
@@ -332,6 +605,18 @@ class Environment(object):
             self.print_logs("ERROR: 'multiplemode' value must be 'yes' or 'no'.")
             sys.exit(0)
 
+        if self.seed is not None and not isinstance(self.seed, (int, numpy.integer)):
+            self.print_logs("ERROR: 'seed' value must be an integer or None.")
+            sys.exit(0)
+
+        if self.profile not in ('on','off'):
+            self.print_logs("ERROR: 'profile' value must be 'on' or 'off'.")
+            sys.exit(0)
+
+        if not isinstance(self.action_repeat, (int, numpy.integer)) or self.action_repeat < 1:
+            self.print_logs("ERROR: 'action repeat' value must be an integer greater than 0.")
+            sys.exit(0)
+
         if self.randomini not in ('yes','no'):
             self.print_logs("ERROR: 'random ini' value must be 'yes' or 'no'.")
             sys.exit(0)
@@ -360,6 +645,10 @@ class Environment(object):
             self.print_logs("ERROR: 'contacthurt' value must be 'player' or 'enemy'.")
             sys.exit(0)
 
+        if self.render not in ('screen','none'):
+            self.print_logs("ERROR: 'render' value must be 'screen' or 'none'.")
+            sys.exit(0)
+
         if type(self.timeexpire) is not int:
             self.print_logs("ERROR: 'timeexpire' must be integer.")
             sys.exit(0)
@@ -378,9 +667,15 @@ class Environment(object):
         if self.multiplemode == "no" and len(self.enemies) > 1:
             self.print_logs("MESSAGE: there is more than one enemy in 'enemies' list although the mode is not multiple.")
 
+        if self.render == "none" and self.playermode == "human":
+            self.print_logs("ERROR: 'render' must be 'screen' for human player mode.")
+            sys.exit(0)
+
         if self.level < 1 or self.level > 3:
             self.print_logs("MESSAGE: 'level' chosen is out of recommended (tested).")
 
+        self.config = Config(self)
+
 
 
 
@@ -392,6 +687,20 @@ class Environment(object):
     def cons_multi(self,values):
         return values.mean() - values.std()
 
+    # upper bound of the final fitness_single of the running game. enemy and player lives never
+    # increase, the time never decreases, and the enemy can at most be hit by every player bullet
+    # on the screen, by one bullet every 13 frames (player gun cooldown) and by the contact hurt.
+    def fitness_bound(self):
+
+        frames = self.enemy_module.timeexpire - self.time
+        hits = len(self.sprite_p) - 1 + frames // 13 + 1
+        damage = hits * (20/self.level)
+        if not self.config.hurt_player:
+            damage += frames * self.level
+
+        enemylife = max(0, self.get_enemylife() - damage)
+        return 0.9*(100 - enemylife) + 0.1*self.get_playerlife() - numpy.log(self.get_time())
+
     # measures the energy of the player
     def get_playerlife(self):
         return self.player.life
@@ -406,74 +715,153 @@ class Environment(object):
 
 
     # runs game for a single enemy
-    def run_single(self,enemyn,pcont,econt):
+    def run_single(self,enemyn,pcont,econt,seed=None,prune_below=None):
+
+        self.start_run(enemyn,pcont,econt,seed,prune_below)
+
+        # game main loop
+
+        while 1:
+
+            # stops the run if the screen has been closed
+            if not self.start_frame():
+                return
+
+            result = self.finish_frame()
+            if result is not None:
+                return result
+
+
+    # prepares the game for a new run against the enemy
+    def start_run(self,enemyn,pcont,econt,seed=None,prune_below=None):
 
         # sets controllers
         self.pcont = pcont
         self.econt = econt
 
-        self.checks_params()
+        # parameters are validated once, and again only after they change
+        if self.config is None:
+            self.checks_params()
+        config = self.config
+
+        # all randomness of the episode comes from its own generator
+        self.episode_seed = self.get_seed(seed)
+        self.rng = numpy.random.default_rng(self.episode_seed)
+        for controller in (self.player_controller, self.enemy_controller):
+            if isinstance(controller, Controller):
+                controller.rng = self.rng
 
 
         self.enemyn = enemyn # sets the current enemy
-        ends = 0
+        self.ends = 0
         self.time = 0
         self.freeze_p = False
         self.freeze_e = False
         self.start = False
+        self.player_actions = None
+        self.prune_below = prune_below if not config.human else None
+        self.pruned = False
 
-        enemy = __import__('enemy'+str(self.enemyn))
+        self.enemy_module = __import__('enemy'+str(self.enemyn))
 
         self.load_sprites()
 
+        # times the phases of the run, collisions are timed wherever sprites check them
+        if config.profile:
+            triggers = self.tilemap.layers['triggers']
+            triggers.collide = _profiled(self, 'collisions', triggers.collide)
+            self.phases = ['other']
+            self.lap_time = time.perf_counter()
 
-        # game main loop
 
-        while 1:
-
-            # adjusts frames rate for defining game speed
+    # first part of a game loop iteration: updates everything up to the point where the player
+    # decides its actions. returns False if the screen has been closed.
+    def start_frame(self):
 
-            if self.clockprec == "medium":  # medium clock precision
-                if self.speed == 'normal':
-                    self.clock.tick_busy_loop(30)
-                elif self.speed == 'fastest':
-                    self.clock.tick_busy_loop()
+        config = self.config
 
-            else:   # low clock precision
+        if self.phases:
+            self.profiled_frames += 1
 
-                if self.speed == 'normal':
-                    self.clock.tick(30)
-                elif self.speed == 'fastest':
-                    self.clock.tick()
+        # adjusts frames rate for defining game speed
+        self.enter('clock')
 
+        if config.busy_clock:  # medium clock precision
+            if not config.fastest:
+                self.clock.tick_busy_loop(30)
+            else:
+                self.clock.tick_busy_loop()
 
-            # game timer
-            self.time += 1
-            if self.playermode == "human" or self.sound == "on":
-                # sound effects
-                if self.sound == "on" and self.time == 1:
-                    sound = pygame.mixer.Sound('evoman/sounds/open.wav')
-                    c = pygame.mixer.Channel(1)
-                    c.set_volume(1)
-                    c.play(sound,loops=10)
+        else:   # low clock precision
 
-                if self.time > self.overturetime: # delays game start a little bit for human mode
-                    self.start = True
+            if not config.fastest:
+                self.clock.tick(30)
             else:
+                self.clock.tick()
+
+        self.leave()
+
+
+        # game timer
+        self.time += 1
+        if config.human or config.sound:
+            # sound effects
+            if config.sound and self.time == 1:
+                sound = pygame.mixer.Sound('evoman/sounds/open.wav')
+                c = pygame.mixer.Channel(1)
+                c.set_volume(1)
+                c.play(sound,loops=10)
+
+            if self.time > self.overturetime: # delays game start a little bit for human mode
                 self.start = True
+        else:
+            self.start = True
 
 
-            # checks screen closing button
+        # checks screen closing button
+        self.enter('events')
+        if config.draws:
             self.event = pygame.event.get()
-            for event in  self.event:
-                if event.type == pygame.QUIT:
-                    return
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    return
+        else:
+            self.event = []
+        self.leave()
+        for event in  self.event:
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return False
+
+        # updates objects of the layers below the player (map and enemy)
+        for layer in self.tilemap.layers:
+            if layer is not self.sprite_p:
+                if self.phases:
+                    self.update_profiled(layer)
+                else:
+                    layer.update( 33 / 1000., self)
+
+        return True
+
+
+    # tells if the player is going to ask for actions in the current frame
+    def player_decides(self):
+        return not self.config.human and self.player.alive() and self.freeze_p == 0 and self.start == 1 and self.player.repeat == 0
+
 
-            # updates objects and draws its itens on screen
+    # second part of a game loop iteration: updates the player and draws its itens on screen.
+    # returns the results of the run when it has ended, None otherwise.
+    def finish_frame(self):
+
+        config = self.config
+
+        # updates player objects
+        if self.phases:
+            self.update_profiled(self.sprite_p)
+        else:
+            self.sprite_p.update( 33 / 1000., self)
+
+        if config.draws:
+            self.enter('drawing')
             self.screen.fill((250,250,250))
-            self.tilemap.update( 33 / 1000., self)
             self.tilemap.draw(self.screen)
 
             # player life bar
@@ -489,101 +877,189 @@ class Environment(object):
             pygame.draw.line(self.screen, (0,   0,   0), [590, 45],[695, 45], 5)
             pygame.draw.line(self.screen, (194,118,55),  [590, 45],[695 - vbar, 45], 5)
             pygame.draw.line(self.screen, (0,   0,   0), [590, 49],[695, 49], 2)
+            self.leave()
 
 
-            #gets fitness for training agents
-            fitness = self.fitness_single()
+        #gets fitness for training agents
+        fitness = self.fitness_single()
 
 
-            # returns results of the run
-            def return_run():
-                self.print_logs("RUN: run status: enemy: "+str(self.enemyn)+"; fitness: " + str(fitness) + "; player life: " + str(self.player.life)  + "; enemy life: " + str(self.enemy.life) + "; time: " + str(self.time))
+        if self.start == False and config.human:
 
-                return  fitness, self.player.life, self.enemy.life, self.time
+            myfont = pygame.font.SysFont("Comic sams", 100)
+            pygame.font.Font.set_bold
+            self.screen.blit(myfont.render("Player", 1,  (150,24,25)), (50, 180))
+            self.screen.blit(myfont.render("  VS  ", 1,  (50,24,25)), (250, 180))
+            self.screen.blit(myfont.render("Enemy "+str(self.enemyn), 1,  (194,118,55)), (400, 180))
 
 
+        # checks player life status
+        if self.player.life == 0:
+            self.ends -= 1
 
-            if self.start == False and self.playermode == "human":
+            # tells user that player has lost
+            if config.human:
+                myfont = pygame.font.SysFont("Comic sams", 100)
+                pygame.font.Font.set_bold
+                self.screen.blit(myfont.render(" Enemy wins", 1, (194,118,55)), (150, 180))
+
+            self.player.kill() # removes player sprite
+            self.enemy.kill()  # removes enemy sprite
+
+            if config.human:
+                # delays run finalization for human mode
+                if self.ends == -self.overturetime:
+                    return self.return_run(fitness)
+            else:
+                return self.return_run(fitness)
+
+
+        # checks enemy life status
+        if self.enemy.life == 0:
+            self.ends -= 1
+
+            if config.draws:
+                self.screen.fill((250,250,250))
+                self.tilemap.draw(self.screen)
 
+            # tells user that player has won
+            if config.human:
                 myfont = pygame.font.SysFont("Comic sams", 100)
                 pygame.font.Font.set_bold
-                self.screen.blit(myfont.render("Player", 1,  (150,24,25)), (50, 180))
-                self.screen.blit(myfont.render("  VS  ", 1,  (50,24,25)), (250, 180))
-                self.screen.blit(myfont.render("Enemy "+str(self.enemyn), 1,  (194,118,55)), (400, 180))
+                self.screen.blit(myfont.render(" Player wins ", 1, (150,24,25) ), (170, 180))
 
+            self.enemy.kill()   # removes enemy sprite
+            self.player.kill()  # removes player sprite
 
-            # checks player life status
-            if self.player.life == 0:
-                ends -= 1
+            if config.human:
+                if self.ends == -self.overturetime:
+                    return self.return_run(fitness)
+            else:
+                return self.return_run(fitness)
 
-                # tells user that player has lost
-                if self.playermode == "human":
-                    myfont = pygame.font.SysFont("Comic sams", 100)
-                    pygame.font.Font.set_bold
-                    self.screen.blit(myfont.render(" Enemy wins", 1, (194,118,55)), (150, 180))
 
-                self.player.kill() # removes player sprite
-                self.enemy.kill()  # removes enemy sprite
+        if not config.load_player:# removes player sprite from game
+            self.player.kill()
 
-                if self.playermode == "human":
-                    # delays run finalization for human mode
-                    if ends == -self.overturetime:
-                        return return_run()
-                else:
-                    return return_run()
+        if not config.load_enemy:  #removes enemy sprite from game
+            self.enemy.kill()
 
+            # updates screen
+        if config.draws:
+            self.enter('display')
+            pygame.display.flip()
+            self.leave()
 
-            # checks enemy life status
-            if self.enemy.life == 0:
-                ends -= 1
 
-                self.screen.fill((250,250,250))
-                self.tilemap.draw(self.screen)
+        # game runtime limit
+        if not config.human:
+            if self.time >= self.enemy_module.timeexpire:
+                return self.return_run(fitness)
 
-                # tells user that player has won
-                if self.playermode == "human":
-                    myfont = pygame.font.SysFont("Comic sams", 100)
-                    pygame.font.Font.set_bold
-                    self.screen.blit(myfont.render(" Player wins ", 1, (150,24,25) ), (170, 180))
+            # stops runs that can not reach the wanted fitness anymore, returning their fitness bound
+            if self.prune_below is not None:
+                bound = self.fitness_bound()
+                if bound < self.prune_below:
+                    self.pruned = True
+                    return self.return_run(bound)
 
-                self.enemy.kill()   # removes enemy sprite
-                self.player.kill()  # removes player sprite
+        else:
+            if self.time >= self.timeexpire:
+                return self.return_run(fitness)
 
-                if self.playermode == "human":
-                    if ends == -self.overturetime:
-                        return return_run()
-                else:
-                    return return_run()
 
+    # plays frames until the player has to decide its actions, returning the results of the run
+    # if it ends before. closing the screen ends the run with its current results.
+    def next_decision(self):
 
-            if self.loadplayer == "no":# removes player sprite from game
-                self.player.kill()
+        while self.start_frame():
+            if self.player_decides():
+                return None
 
-            if self.loadenemy == "no":  #removes enemy sprite from game
-                self.enemy.kill()
+            result = self.finish_frame()
+            if result is not None:
+                return result
 
-                # updates screen
-            pygame.display.flip()
+        return self.return_run(self.fitness_single())
 
 
-            # game runtime limit
-            if self.playermode == 'ai':
-                if self.time >= enemy.timeexpire:
-                    return return_run()
+    # starts a run against the enemy (the first one of the list by default) to be played step by
+    # step by an external agent, returning the sensors at the first decision of the player
+    def reset(self,enemy=None,seed=None,econt="None"):
 
-            else:
-                if self.time >= self.timeexpire:
-                    return return_run()
+        if enemy is None:
+            enemy = self.enemies[0]
+
+        self.start_run(enemy,None,econt,seed)
+        self.step_fitness = 0
+        self.step_result = self.next_decision()
+
+        self.enter('sensors')
+        sensors = self.player.sensors.get(self)
+        self.leave()
+        if self.phases:
+            self.lap()   # the time the agent takes to decide is not timed
+        return sensors
+
+
+    # plays the player actions and the following frames until the next decision of the player.
+    # returns the sensors, the reward (rewards of a run add up to its final fitness), if the run
+    # has ended, and the current fitness, lives and time.
+    def step(self,action):
+
+        if self.step_result is not None:
+            self.print_logs("ERROR: the run has ended, 'reset' must be called before 'step'.")
+            sys.exit(0)
+
+        if self.phases:
+            self.lap_time = time.perf_counter()
+
+        self.player_actions = action
+        result = self.finish_frame()
+        self.player_actions = None
+
+        if result is None:
+            result = self.next_decision()
+        self.step_result = result
+
+        if result is None:
+            fitness = self.fitness_single()
+            info = {'fitness': fitness, 'player_life': self.get_playerlife(), 'enemy_life': self.get_enemylife(), 'time': self.get_time()}
+        else:
+            fitness = result[0]
+            info = {'fitness': fitness, 'player_life': result[1], 'enemy_life': result[2], 'time': result[3]}
+
+        reward = fitness - self.step_fitness
+        self.step_fitness = fitness
+
+        self.enter('sensors')
+        sensors = self.player.sensors.get(self)
+        self.leave()
+        if self.phases:
+            self.lap()
+        return sensors, reward, result is not None, info
+
+
+    # returns results of the run
+    def return_run(self, fitness):
+        self.print_logs("RUN: run status: enemy: "+str(self.enemyn)+"; seed: "+str(self.episode_seed)+"; fitness: " + str(fitness) + "; player life: " + str(self.player.life)  + "; enemy life: " + str(self.enemy.life) + "; time: " + str(self.time))
+
+        # the run is not timed anymore
+        if self.phases:
+            self.lap()
+            self.phases = []
+
+        return  fitness, self.player.life, self.enemy.life, self.time
 
 
 
     # repeats run for every enemy in list
-    def multiple(self,pcont,econt):
+    def multiple(self,pcont,econt,seed=None):
 
         vfitness, vplayerlife, venemylife, vtime = [],[],[],[]
         for e in self.enemies:
 
-            fitness, playerlife, enemylife, time  = self.run_single(e,pcont,econt)
+            fitness, playerlife, enemylife, time  = self.run_single(e,pcont,econt,seed)
             vfitness.append(fitness)
             vplayerlife.append(playerlife)
             venemylife.append(enemylife)
@@ -597,10 +1073,133 @@ class Environment(object):
         return    vfitness, vplayerlife, venemylife, vtime
 
 
-    # checks objective mode
-    def play(self,pcont="None",econt="None"):
+    # seed of an episode: the given one, else the one of the environment, else one drawn from numpy's global state
+    def get_seed(self, seed=None):
+
+        if seed is None:
+            seed = self.seed
+        if seed is None:
+            seed = int(numpy.random.randint(2**31))
+        return seed
+
+
+    # checks objective mode. prune_below (single mode only) stops the run as soon as its final
+    # fitness is known to be lower than the given value, then the returned fitness is its upper
+    # bound and the flag pruned is set.
+    def play(self,pcont="None",econt="None",seed=None,prune_below=None):
+
+        # every enemy of a multiple mode run plays with the same seed
+        seed = self.get_seed(seed)
+
+        # runs already played with the same inputs are not simulated again
+        key = self.cache_key(pcont,econt,seed)
+        if key is not None:
+            result = self.cache.get(key)
+            if result is not None:
+                self.pruned = False
+                return result
 
         if self.multiplemode == "yes":
-            return self.multiple(pcont,econt)
+            if prune_below is not None:
+                self.print_logs("MESSAGE: 'prune_below' is ignored in multiple mode.")
+            result = self.multiple(pcont,econt,seed)
         else:
-            return self.run_single(self.enemies[0],pcont,econt)
+            result = self.run_single(self.enemies[0],pcont,econt,seed,prune_below)
+
+        # bounds of pruned runs are not their results
+        if key is not None and result is not None and not self.pruned:
+            self.cache.put(key, result)
+        return result
+
+
+    # key of a run in the evaluation cache, None if runs are not cached
+    def cache_key(self,pcont,econt,seed):
+
+        if self.cache is None or self.playermode != "ai":
+            return None
+        return self.cache.key(self, pcont, econt, seed)
+
+
+    # plays every controller in the list on a pool of worker processes, returning results in order
+    def play_many(self,pconts,econt="None",workers=None,seeds=None):
+
+        if workers is None:
+            workers = os.cpu_count()
+
+        # seeds are decided here, so results do not depend on which worker plays each controller
+        if seeds is None:
+            seeds = [None] * len(pconts)
+        seeds = [self.get_seed(seed) for seed in seeds]
+
+        if workers <= 1:
+            return [self.play(pcont,econt,seed) for pcont, seed in zip(pconts, seeds)]
+
+        # only runs missing in the cache are sent to the workers
+        results = [None] * len(pconts)
+        keys = [self.cache_key(pcont,econt,seed) for pcont, seed in zip(pconts, seeds)]
+        for i, key in enumerate(keys):
+            if key is not None:
+                results[i] = self.cache.get(key)
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        # workers keep a warm headless copy of this environment, rebuilt when parameters change
+        params = dict((name, getattr(self, name)) for name in self.params)
+        params['solutions'] = None
+        params['cache'] = None
+        params['render'] = "none"
+
+        if self.pool is None or self.pool_params != (workers, params):
+            self.close_pool()
+            self.pool = multiprocessing.Pool(workers, _init_worker, (params,))
+            self.pool_params = (workers, params)
+
+        played = self.pool.map(_play_worker, [(pconts[i], econt, seeds[i]) for i in missing])
+        for i, (result, timings, frames) in zip(missing, played):
+            results[i] = result
+
+            # phases timed by the workers add up to the ones of this environment
+            for phase, seconds in timings.items():
+                self.timings[phase] = self.timings.get(phase, 0) + seconds
+            self.profiled_frames += frames
+            if keys[i] is not None:
+                self.cache.put(keys[i], result)
+
+        return results
+
+
+    # terminates the worker processes of play_many
+    def close_pool(self):
+
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            self.pool_params = None
+
+
+
+# environment owned by a play_many worker process
+_worker_env = None
+
+def _init_worker(params):
+    global _worker_env
+    params = dict(params)
+    savelogs = params.pop('savelogs')
+    _worker_env = Environment(savelogs="no", **params)
+
+    # logs go to a file of this worker, the main file is left to the parent
+    _worker_env.savelogs = savelogs
+    _worker_env.logs_worker = os.getpid()
+    if _worker_env.logs == "on" and savelogs == "yes":
+        log_writer.writer(_worker_env.logs_path()).truncate()
+    # pygame turns SIGTERM into a quit event, workers must still die when the pool is terminated
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def _play_worker(args):
+    pcont, econt, seed = args
+    result = _worker_env.play(pcont, econt, seed)
+
+    # timed phases are sent back along with the results
+    timings, frames = _worker_env.timings, _worker_env.profiled_frames
+    _worker_env.timings, _worker_env.profiled_frames = {}, 0
+    return result, timings, frames
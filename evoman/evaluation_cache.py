@@ -0,0 +1,185 @@
+import os
+import sys
+import glob
+import atexit
+import json
+import pickle
+import hashlib
+import sqlite3
+import collections
+import numpy
+
+
+# environment parameters that change the outcome of a run
+key_params = ('enemies', 'multiplemode', 'level', 'playermode', 'enemymode', 'contacthurt', 'randomini',
+              'inputscoded', 'timeexpire', 'overturetime', 'loadplayer', 'loadenemy', 'action_repeat')
+
+_fingerprint = None
+
+# hash of the simulation sources and maps, results cached by another version of the game are never used
+def fingerprint():
+    global _fingerprint
+
+    if _fingerprint is None:
+        base = os.path.dirname(os.path.abspath(__file__))
+        files = glob.glob(os.path.join(base, '*.py')) + glob.glob(os.path.join(base, 'Base', '*.py')) + glob.glob(os.path.join(base, '*.tmx'))
+        h = hashlib.sha1()
+        for name in sorted(files):
+            h.update(os.path.relpath(name, base).encode())
+            with open(name, 'rb') as f:
+                h.update(f.read())
+        _fingerprint = h.hexdigest()
+
+    return _fingerprint
+
+
+# bytes identifying a controller solution: weights arrays, NEAT genomes or anything picklable
+def solution_bytes(solution):
+
+    if isinstance(solution, numpy.ndarray):
+        return str((solution.dtype.str, solution.shape)).encode() + numpy.ascontiguousarray(solution).tobytes()
+
+    if hasattr(solution, 'nodes') and hasattr(solution, 'connections'):
+        nodes = sorted((k, n.bias, n.response, n.activation, n.aggregation) for k, n in solution.nodes.items())
+        connections = sorted((k, c.weight, c.enabled) for k, c in solution.connections.items())
+        return repr((nodes, connections)).encode()
+
+    if isinstance(solution, (list, tuple)):
+        return b'[' + b','.join(solution_bytes(s) for s in solution) + b']'
+
+    return pickle.dumps(solution, protocol=2)
+
+
+_file_hashes = {}
+
+# hash of the contents of a file, read once per file
+def file_hash(path):
+
+    if path not in _file_hashes:
+        with open(path, 'rb') as f:
+            _file_hashes[path] = hashlib.sha1(f.read()).hexdigest()
+    return _file_hashes[path]
+
+
+# name and structure of a controller, the same solution means different players for different controllers.
+# the sources of the controller class (and of its bases) are part of it, so results are not reused after
+# the controller changes, and so are the contents of its configuration file if it has one (e.g. NEAT ones).
+def controller_id(controller):
+
+    if controller is None:
+        return 'None'
+    cid = type(controller).__module__ + '.' + type(controller).__name__ + repr(getattr(controller, 'n_hidden', None))
+    for cls in type(controller).__mro__:
+        source = getattr(sys.modules.get(cls.__module__), '__file__', None)
+        if source is not None and source.endswith('.py'):
+            cid += ' ' + file_hash(source)
+    config_file = getattr(controller, 'config_file', None)
+    if config_file is not None:
+        cid += ' ' + file_hash(config_file)
+    return cid
+
+
+# results as stored in the file: every value with the numpy type it had (None for python values),
+# so results read back have the same types as the ones returned by play
+def encode_result(result):
+    return json.dumps([[v.dtype.str, v.item()] if isinstance(v, numpy.generic) else [None, v] for v in result])
+
+def decode_result(text):
+    return tuple(v if t is None else numpy.dtype(t).type(v) for t, v in json.loads(text))
+
+
+# results of runs, kept in memory (least recently used are dropped first) and optionally in a sqlite file
+class EvaluationCache(object):
+
+
+    # size: number of results kept in memory, path: sqlite file where results are also stored,
+    # commit_every: results stored in the file by each of its transactions
+    def __init__(self, size=10000, path=None, commit_every=100):
+
+        self.size = size
+        self.path = path
+        self.commit_every = commit_every
+        self.pending = 0   # results stored since the last commit
+        self.results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT)")
+            self.db.commit()
+            atexit.register(self.close)
+
+
+    # key of a run of the environment with the given controllers and seed
+    def key(self, env, pcont, econt, seed):
+
+        h = hashlib.sha1()
+        h.update(fingerprint().encode())
+        h.update(repr(tuple(getattr(env, name) for name in key_params)).encode())
+        h.update(repr((type(env).__name__, seed)).encode())
+        h.update(controller_id(env.player_controller).encode())
+        h.update(solution_bytes(pcont))
+        if env.enemymode == "ai":
+            h.update(controller_id(env.enemy_controller).encode())
+            h.update(solution_bytes(econt))
+        return h.hexdigest()
+
+
+    # gets the result of a run, or None if it has not been cached
+    def get(self, key):
+
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+        elif self.db is not None:
+            row = self.db.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                result = decode_result(row[0])
+                self.remember(key, result)
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+
+    # stores the result of a run
+    def put(self, key, result):
+
+        result = tuple(result)
+        self.remember(key, result)
+
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, encode_result(result)))
+            self.pending += 1
+            if self.pending >= self.commit_every:
+                self.commit()
+
+
+    # commits the results stored in the file since the last commit
+    def commit(self):
+
+        if self.db is not None and self.pending:
+            self.db.commit()
+            self.pending = 0
+
+
+    # keeps a result in memory, dropping the least recently used ones
+    def remember(self, key, result):
+
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+
+    # commits the pending results and closes the file, also done when the program ends
+    def close(self):
+
+        if self.db is not None:
+            self.commit()
+            self.db.close()
+            self.db = None
@@ -0,0 +1,1240 @@
+import ast
+import sys
+import struct
+import numpy
+import log_writer
+from xml.etree import ElementTree
+
+
+# simulation core of the games without pygame: the state of every game is kept in flat numpy
+# arrays (one row per game) and each frame updates all the games at once. it follows the rules
+# of the player, its bullets, the eight static enemies and their bullets exactly as the sprites
+# of the reference Environment do, including the order of the updates, the rounding of the
+# positions to integer pixels and the random numbers of each episode. verify() compares both.
+
+dt = 33 / 1000.
+
+sprite_size = (43, 59)   # player and enemies
+
+
+# pygame rects round the assigned positions to the nearest integer, halves away from zero
+def _round(v):
+    a = numpy.abs(v)
+    r = numpy.floor(a)
+    r += (a - r) >= 0.5
+    return numpy.where(v < 0, -r, r)
+
+
+# tells if two rects overlap, like pygame's colliderect
+def _collide(ax, ay, aw, ah, bx, by, bw, bh):
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+_image_sizes = {}
+
+# width and height of a png image, read from its header
+def _image_size(name):
+    if name not in _image_sizes:
+        with open('evoman/images/' + name, 'rb') as f:
+            _image_sizes[name] = struct.unpack('>II', f.read(24)[16:24])
+    return _image_sizes[name]
+
+
+# settings of an enemy module (map and time limit), read without importing pygame
+def _enemy_settings(enemyn):
+    with open('evoman/enemy' + str(enemyn) + '.py') as f:
+        tree = ast.parse(f.read())
+
+    settings = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id in ('tilemap', 'timeexpire'):
+                settings[node.targets[0].id] = ast.literal_eval(node.value)
+    return settings['tilemap'], settings['timeexpire']
+
+
+# properties of an xml element
+def _properties(tag):
+    props = tag.find('properties')
+    if props is None:
+        return {}
+    return dict((p.attrib['name'], p.attrib['value']) for p in props.findall('property'))
+
+
+_maps = {}
+
+# triggers of a map: blockers and killers (left, top, right, bottom, sides) in the order of the
+# map file, and the start positions of the player and the enemy
+def _load_map(path):
+
+    if path not in _maps:
+        root = ElementTree.parse(path).getroot()
+
+        # tiles of the map with their height and properties, by gid
+        tilesets = []
+        for tag in root.findall('tileset'):
+            firstgid = int(tag.attrib['firstgid'])
+            if 'source' in tag.attrib:
+                tag = ElementTree.parse(tag.attrib['source']).getroot()
+            tiles = dict((int(t.attrib['id']), _properties(t)) for t in tag.findall('tile'))
+            tilesets.append((firstgid, int(tag.attrib['tileheight']), tiles))
+        tilesets.sort(key=lambda t: t[0])
+
+        blockers, killers, starts = [], [], {}
+        for layer in root.findall('objectgroup'):
+            if layer.attrib['name'] != 'triggers':
+                continue
+
+            for tag in layer.findall('object'):
+                x, y = int(tag.attrib['x']), int(tag.attrib['y'])
+                props = _properties(tag)
+                if 'gid' in tag.attrib:
+                    gid = int(tag.attrib['gid'])
+                    firstgid, height, tiles = [t for t in tilesets if t[0] <= gid][-1]
+                    props.update(tiles.get(gid - firstgid, {}))
+                    y -= height
+                    for role in ('player', 'enemy'):
+                        if role in props and role not in starts:
+                            starts[role] = (x, y)
+                    continue
+
+                cell = (x, y, x + int(tag.attrib['width']), y + int(tag.attrib['height']))
+                if 'blockers' in props:
+                    blockers.append(cell + (props['blockers'],))
+                if 'killers' in props:
+                    killers.append(cell + (props['killers'],))
+
+        _maps[path] = (blockers, killers, starts['player'], starts['enemy'])
+
+    return _maps[path]
+
+
+# environment parameters the kernel simulates only with these values
+_fixed_params = {'playermode': "ai", 'enemymode': "static", 'loadplayer': "yes", 'loadenemy': "yes",
+                 'inputscoded': "no", 'cache': None}
+
+
+# steps n games in lockstep, like VectorEnvironment, with the state of the games in numpy arrays.
+# the parameters are the ones of Environment, the ones about drawing the games are ignored.
+class Kernel(object):
+
+
+    def __init__(self, n, experiment_name='test', multiplemode="no", enemies=[1], level=2,
+                 contacthurt="player", randomini="no", logs="on", savelogs="yes",
+                 player_controller=None, seed=None, action_repeat=1, **params):
+
+        self.n = n
+        self.experiment_name = experiment_name
+        self.multiplemode = multiplemode
+        self.enemies = enemies
+        self.level = level
+        self.contacthurt = contacthurt
+        self.randomini = randomini
+        self.logs = logs
+        self.savelogs = savelogs
+        self.player_controller = player_controller
+        self.seed = seed
+        self.action_repeat = action_repeat
+
+        for name, value in params.items():
+            if name in _fixed_params and value != _fixed_params[name]:
+                self.print_logs("ERROR: '"+name+"' must be "+repr(_fixed_params[name])+" for the simulation kernel.")
+                sys.exit(0)
+
+        if self.multiplemode == "yes" and len(self.enemies) < 2:
+            self.print_logs("ERROR: 'enemies' must contain more than one enemy for multiple mode.")
+            sys.exit(0)
+
+        if self.contacthurt not in ('player','enemy'):
+            self.print_logs("ERROR: 'contacthurt' value must be 'player' or 'enemy'.")
+            sys.exit(0)
+
+        if self.randomini not in ('yes','no'):
+            self.print_logs("ERROR: 'randomini' value must be 'yes' or 'no'.")
+            sys.exit(0)
+
+        if type(self.action_repeat) is not int or self.action_repeat < 1:
+            self.print_logs("ERROR: 'action_repeat' must be an integer greater than 0.")
+            sys.exit(0)
+
+        self.bullet_p = _image_size('bullet_r.png')
+        self.enemy_updates = {1: self.enemy1, 2: self.enemy2, 3: self.enemy3, 4: self.enemy4,
+                              5: self.enemy5, 6: self.enemy6, 7: self.enemy7, 8: self.enemy8}
+
+
+    def print_logs(self, msg):
+        if self.logs == "on":
+            print('\n'+msg) # prints log messages to screen
+
+            if self.savelogs == "yes": # prints log messages to file, written in the background
+                log_writer.writer(self.experiment_name+'/evoman_logs.txt').write('\n\n'+msg)
+
+
+    # seed of an episode: the given one, else the one of the kernel, else one drawn from numpy's global state
+    def get_seed(self, seed=None):
+
+        if seed is None:
+            seed = self.seed
+        if seed is None:
+            seed = int(numpy.random.randint(2**31))
+        return seed
+
+
+    # starts one game per seed against the enemy (the first one of the list by default),
+    # returning the sensors of the games at the first decision of their players
+    def reset(self, enemy=None, seeds=None):
+
+        if enemy is None:
+            enemy = self.enemies[0]
+        if seeds is None:
+            seeds = [None] * self.n
+        seeds = [self.get_seed(seed) for seed in seeds]
+        g = len(seeds)
+
+        self.enemyn = enemy
+        tilemap, self.timeexpire = _enemy_settings(enemy)
+        self.blockers, self.killers, player_start, enemy_start = _load_map(tilemap)
+        self.rngs = [numpy.random.default_rng(seed) for seed in seeds]
+
+        def zeros(dtype=float):
+            return numpy.zeros(g, dtype)
+
+        # games
+        self.time = zeros(int)
+        self.done = zeros(bool)
+        self.freeze_p = zeros(bool)
+        self.freeze_e = zeros(bool)
+        self.fitness = zeros()
+        self.step_fitness = zeros()
+
+        # player
+        self.px = numpy.full(g, float(player_start[0]))
+        self.py = numpy.full(g, float(player_start[1]))
+        self.pdy = zeros()
+        self.pdirection = numpy.ones(g)
+        self.presting = zeros(bool)
+        self.pgun_cooldown = zeros()
+        self.plife = numpy.full(g, 100.)
+        self.patacked = zeros(bool)
+        self.pinwater = numpy.full(g, enemy == 7)
+        self.pactions = numpy.zeros((g, 5), int)
+        self.prepeat = zeros(int)
+
+        # enemy, with the fields only some of the enemies use
+        self.ex = numpy.full(g, float(enemy_start[0]))
+        self.ey = numpy.full(g, float(enemy_start[1]))
+        if enemy == 4:
+            self.ex[:] = 580 - sprite_size[0]
+        if enemy == 5:
+            self.ex[:] = 500
+        self.edy = zeros()
+        self.edirection = -numpy.ones(g)
+        self.eresting = zeros(bool)
+        self.elife = numpy.full(g, 100.)
+        self.eimune = zeros(bool)
+        self.timeenemy = zeros(int)
+        self.egun_cooldown = zeros()
+        self.egun_cooldown2 = zeros()
+        self.time_colis = zeros(int)
+        self.fireflash = zeros(int)
+        self.emove = zeros(bool)
+        self.direction_floor = numpy.ones(g)
+        self.just_shoot = zeros(bool)
+        self.ebullets = zeros(int)
+
+        # player bullets, in any order
+        self.pb_alive = numpy.zeros((g, 4), bool)
+        self.pb_x = numpy.zeros((g, 4))
+        self.pb_y = numpy.zeros((g, 4))
+        self.pb_direction = numpy.zeros((g, 4))
+
+        # enemy bullets, in the order they were shot (the order of the sensors)
+        self.b_count = zeros(int)
+        self.b_alive = numpy.zeros((g, 16), bool)
+        self.b_fields = ('b_x', 'b_y', 'b_w', 'b_h', 'b_direction', 'b_lifespan', 'b_n', 'b_kind', 'b_aux')
+        for name in self.b_fields:
+            setattr(self, name, numpy.zeros((g, 16)))
+        self.shots = []
+
+        self.next_decision()
+        return self.sensors()
+
+
+    # plays the actions of the games still running, and the following frames until the next
+    # decision of their players. returns the sensors, the rewards, which games have ended, and
+    # their current fitness, lives and time, like Environment.step.
+    def step(self, actions):
+
+        running = ~self.done
+        self.finish_frame(running, numpy.asarray(actions))
+        self.next_decision()
+
+        fitness = numpy.where(self.done, self.fitness, self.fitness_single())
+        reward = numpy.where(running, fitness - self.step_fitness, 0)
+        self.step_fitness = fitness
+
+        info = {'fitness': fitness, 'player_life': self.plife.copy(), 'enemy_life': self.elife.copy(), 'time': self.time.copy()}
+        return self.sensors(), reward, self.done.copy(), info
+
+
+    # plays frames until every running game gets to a decision of its player
+    def next_decision(self):
+
+        m = ~self.done
+        while m.any():
+            self.start_frame(m)
+
+            m &= self.freeze_p | (self.prepeat > 0)
+            if not m.any():
+                break
+            self.finish_frame(m)
+            m &= ~self.done
+
+
+    def fitness_single(self):
+        return 0.9*(100 - self.elife) + 0.1*self.plife - numpy.log(self.time)
+
+
+    # sensors of the players: distances to the enemy and its bullets, and both directions
+    def sensors(self):
+
+        posx_p = self.px + sprite_size[0]/2
+        posy_p = self.py + sprite_size[1] - sprite_size[1]/2
+        posx_e = self.ex + sprite_size[0]/2
+        posy_e = self.ey + sprite_size[1] - sprite_size[1]/2
+
+        # bullets first, in the order they were shot
+        order = numpy.argsort(~self.b_alive, axis=1, kind='stable')
+        alive = numpy.take_along_axis(self.b_alive, order, 1)
+        w = numpy.take_along_axis(self.b_w, order, 1)
+        h = numpy.take_along_axis(self.b_h, order, 1)
+        dx = posx_p[:, None] - (numpy.take_along_axis(self.b_x, order, 1) + w/2)
+        dy = posy_p[:, None] - (numpy.take_along_axis(self.b_y, order, 1) + h - h/2)
+
+        k = max(8, int(alive.sum(1).max()))
+        values = numpy.zeros((len(self.time), 4 + 2*k))
+        values[:, 0] = posx_p - posx_e
+        values[:, 1] = posy_p - posy_e
+        values[:, 2] = self.pdirection
+        values[:, 3] = self.edirection
+        c = min(k, alive.shape[1])
+        values[:, 4::2][:, :c] = numpy.where(alive, dx, 0)[:, :c]
+        values[:, 5::2][:, :c] = numpy.where(alive, dy, 0)[:, :c]
+        return values
+
+
+    # first part of a frame: updates the enemies and their bullets
+    def start_frame(self, m):
+
+        self.time[m] += 1
+
+        if self.randomini == "yes":
+            positions = [630,610,560,530] if self.enemyn == 2 else [640,500,400,300]
+            for i in numpy.nonzero(m & (self.time == 1))[0]:
+                self.ex[i] = self.rngs[i].choice(positions)
+
+        # bullets shot in this frame start moving in the next one
+        self.enemy_updates[self.enemyn](m)
+        self.enemy_bullets(m)
+        for shot in self.shots:
+            self.add_bullet(*shot)
+        self.shots = []
+
+
+    # second part of a frame: updates the players and their bullets, then ends the games
+    def finish_frame(self, m, actions=None):
+
+        shot = self.player(m & ~self.freeze_p, actions)
+        self.player_bullets(m)
+        self.add_player_bullet(*shot)
+
+        ended = m & ((self.plife == 0) | (self.elife == 0) | (self.time >= self.timeexpire))
+        self.fitness[ended] = self.fitness_single()[ended]
+        self.done |= ended
+
+
+    # moves the rects of the games in the mask against the blockers of the map, checking the
+    # sides in the given order. strict sides also need the rect to come from below the top of the
+    # blocker. returns which games touch the floor, calling hit(side, games) at every correction.
+    def block(self, m, x, y, size, last_x, last_y, dy, order='lrtb', strict='', hit=None):
+
+        w, h = size
+        resting = numpy.zeros(len(x), bool)
+        cells = [(cell, m & ~((x + w < cell[0]) | (y + h < cell[1]) | (x > cell[2]) | (y > cell[3])))
+                 for cell in self.blockers]
+
+        for (left, top, right, bottom, sides), touching in cells:
+            if not touching.any():
+                continue
+
+            for side in order:
+                if side not in sides:
+                    continue
+
+                if side == 'l':
+                    c = touching & (last_x + w <= left) & (x + w > left)
+                    if 'l' in strict:
+                        c &= last_y + h > top
+                    x[c] = left - w
+                elif side == 'r':
+                    c = touching & (last_x >= right) & (x < right)
+                    if 'r' in strict:
+                        c &= last_y + h > top
+                    x[c] = right
+                elif side == 't':
+                    c = touching & (last_y + h <= top) & (y + h > top)
+                    resting |= c
+                    y[c] = top - h
+                    dy[c] = 0
+                else:
+                    c = touching & (last_y >= bottom) & (y < bottom)
+                    y[c] = bottom
+
+                if hit is not None:
+                    hit(side, c)
+
+        return resting
+
+
+    # player update of the games in the mask, returning the bullets it shoots
+    def player(self, m, actions):
+
+        w, h = sprite_size
+
+        # the actions last action_repeat frames
+        repeat = m & (self.prepeat > 0)
+        self.prepeat[repeat] -= 1
+        decide = m & ~repeat
+        if decide.any():
+            self.pactions[decide] = actions[decide]
+            self.prepeat[decide] = self.action_repeat - 1
+        left = (self.pactions[:, 0] != 0) & m
+        right = (self.pactions[:, 1] != 0) & m & ~left
+        jump = (self.pactions[:, 2] == 1) & m
+        shoot = (self.pactions[:, 3] == 1) & m
+        release = (self.pactions[:, 4] == 1) & m
+
+        vx = numpy.where(self.pinwater, 0.5, 1)
+        vy = vx
+        hy = numpy.where(self.pinwater, -2000, -900)
+
+        self.pdy[release & ~self.presting] = 0
+
+        last_x, last_y = self.px.copy(), self.py.copy()
+
+        self.px[left] = _round(self.px - 200 * dt * vx)[left]
+        self.pdirection[left] = -1
+        self.px[right] = _round(self.px + 200 * dt * vx)[right]
+        self.pdirection[right] = 1
+
+        c = self.presting & jump
+        self.pdy[c] = hy[c]
+
+        self.pdy[m] = numpy.minimum(400, self.pdy + 100)[m]
+        self.py[m] = _round(self.py + self.pdy * dt * vy)[m]
+
+        resting = self.block(m, self.px, self.py, sprite_size, last_x, last_y, self.pdy, 'lrtb', 'lr')
+        self.presting[m] = resting[m]
+
+        shoot &= self.pgun_cooldown == 0
+        self.patacked[m] = shoot[m]
+        self.pgun_cooldown[shoot] = 0.4
+        self.pgun_cooldown[m] = numpy.maximum(0, self.pgun_cooldown - dt)[m]
+
+        for left_, top, right_, bottom, sides in self.killers:
+            c = m & ~((self.px + w < left_) | (self.py + h < top) | (self.px > right_) | (self.py > bottom))
+            self.plife[c] = 0
+
+        # bullets leave from the middle of the side the player faces
+        x = numpy.where(self.pdirection > 0, self.px + w, self.px)
+        return shoot, x, self.py + h//2, numpy.where(self.pdirection > 0, 1., -1.)
+
+
+    def add_player_bullet(self, m, x, y, direction):
+
+        if not m.any():
+            return
+
+        if (self.pb_alive.all(1) & m).any():
+            for name in ('pb_alive', 'pb_x', 'pb_y', 'pb_direction'):
+                a = getattr(self, name)
+                setattr(self, name, numpy.concatenate((a, numpy.zeros_like(a)), 1))
+
+        slot = numpy.argmin(self.pb_alive, 1)
+        rows = numpy.nonzero(m)[0]
+        self.pb_alive[rows, slot[rows]] = True
+        self.pb_x[rows, slot[rows]] = x[rows]
+        self.pb_y[rows, slot[rows]] = y[rows]
+        self.pb_direction[rows, slot[rows]] = direction[rows]
+
+
+    def player_bullets(self, m):
+
+        w, h = self.bullet_p
+        for j in range(self.pb_alive.shape[1]):
+            k = m & self.pb_alive[:, j]
+            if not k.any():
+                continue
+            x, y = self.pb_x[:, j], self.pb_y[:, j]
+
+            out = k & ((x + w < 1) | (x > 736) | (y < 1) | (y + h > 512))
+            self.pb_alive[out, j] = False
+            k &= ~out
+
+            x[k] = _round(x + self.pb_direction[:, j] * 600 * dt)[k]
+
+            hit = k & _collide(x, y, w, h, self.ex, self.ey, *sprite_size)
+            c = hit & ~self.eimune
+            self.elife[c] = numpy.maximum(0, self.elife - (20/self.level))[c]
+            if self.enemyn == 4:
+                self.eimune[c] = True
+            self.pb_alive[hit, j] = False
+
+
+    # queues bullets shot by the enemy in the games of the mask
+    def shoot(self, m, x, y, name, direction, lifespan=0, n=0, kind=0, aux=0):
+
+        if m.any():
+            w, h = _image_size(name)
+            self.shots.append((m.copy(), x, y, w, h, direction, lifespan, n, kind, aux))
+
+
+    def add_bullet(self, m, *values):
+
+        if self.b_count[m].max() >= self.b_alive.shape[1]:
+
+            # packs the living bullets at the start of the rows, keeping their order
+            order = numpy.argsort(~self.b_alive, axis=1, kind='stable')
+            for name in ('b_alive',) + self.b_fields:
+                setattr(self, name, numpy.take_along_axis(getattr(self, name), order, 1))
+            self.b_count = self.b_alive.sum(1)
+
+            if self.b_count[m].max() >= self.b_alive.shape[1]:
+                for name in ('b_alive',) + self.b_fields:
+                    a = getattr(self, name)
+                    setattr(self, name, numpy.concatenate((a, numpy.zeros_like(a)), 1))
+
+        rows = numpy.nonzero(m)[0]
+        slots = self.b_count[rows]
+        self.b_alive[rows, slots] = True
+        for name, value in zip(self.b_fields, values):
+            getattr(self, name)[rows, slots] = numpy.broadcast_to(value, m.shape)[rows]
+        self.b_count[rows] += 1
+
+
+    # damage, and push, of the enemy touching the players
+    def contact(self, m, damage, push=None):
+
+        c = m & _collide(self.ex, self.ey, sprite_size[0], sprite_size[1], self.px, self.py, *sprite_size)
+        if self.contacthurt == "player":
+            self.plife[c] = numpy.maximum(0, self.plife - (self.level*damage))[c]
+        if self.contacthurt == "enemy":
+            self.elife[c] = numpy.maximum(0, self.elife - (self.level*damage))[c]
+
+        if push is not None:
+            self.px[c] = numpy.clip(_round(self.px + self.edirection * push * dt), 60, 620)[c]
+        return c
+
+
+    # damage, and push, of enemy bullets touching the players
+    def bullet_hit(self, k, j, w, h, damage, push=None):
+
+        c = k & _collide(self.b_x[:, j], self.b_y[:, j], w, h, self.px, self.py, *sprite_size)
+        self.plife[c] = numpy.maximum(0, self.plife - (self.level*damage))[c]
+
+        if push is not None:
+            self.px[c] = numpy.clip(_round(self.px + self.b_direction[:, j] * push * dt), 60, 620)[c]
+        return c
+
+
+    # player bullets touching enemy bullets are destroyed
+    def destroy_player_bullets(self, k, j, w, h):
+
+        pw, ph = self.bullet_p
+        for i in range(self.pb_alive.shape[1]):
+            c = k & self.pb_alive[:, i] & _collide(self.b_x[:, j], self.b_y[:, j], w, h, self.pb_x[:, i], self.pb_y[:, i], pw, ph)
+            self.pb_alive[c, i] = False
+
+
+    # the enemy turns to the player, when the player is beyond (or, if not strict, just at) its sides
+    def face_player(self, m, strict=True):
+
+        w = sprite_size[0]
+        if strict:
+            left = m & (self.px + w < self.ex)
+            right = m & (self.px > self.ex + w)
+        else:
+            left = m & (self.px + w <= self.ex)
+            right = m & (self.px >= self.ex + w)
+        self.edirection[left] = -1
+        self.edirection[right] = 1
+
+
+    def gravity(self, m, scale=None):
+
+        self.edy[m] = numpy.minimum(400, self.edy + 100)[m]
+        if scale is None:
+            self.ey[m] = _round(self.ey + self.edy * dt)[m]
+        else:
+            self.ey[m] = _round(self.ey + self.edy * dt * scale)[m]
+
+
+    def move(self, m, speed):
+
+        self.ex[m] = _round(self.ex + self.edirection * speed * dt)[m]
+
+
+    def enemy_bullets(self, m):
+
+        for j in range(int(self.b_count[m].max()) if m.any() else 0):
+            k = m & self.b_alive[:, j]
+            if k.any():
+                getattr(self, 'bullet_e' + str(self.enemyn))(k, j)
+
+
+    # bullets leaving the screen are destroyed, returning the ones left
+    def leave_screen(self, k, j, w, h):
+
+        x, y = self.b_x[:, j], self.b_y[:, j]
+        out = k & ((x + w < 1) | (x > 736) | (y + h < 1) | (y > 512))
+        self.b_alive[out, j] = False
+        return k & ~out
+
+
+    # enemy 1, flashman
+    def enemy1(self, m):
+
+        self.timeenemy[m] += 1
+        t = self.timeenemy
+        atack2 = m & (t >= 200) & (t < 260)
+        atack3 = m & (t == 220)
+
+        mv = m & ~self.freeze_e
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+        self.move(mv, 100)
+        self.face_player(mv)
+
+        c = self.contact(mv, 1)
+        self.time_colis[c] += 1
+        c &= self.time_colis > 15
+        self.time_colis[c] = 0
+        self.edy[c] = -600
+
+        self.gravity(mv)
+
+        # jumps when finds a wall in the middle plataforms
+        def hit(side, c):
+            if side == 'l':
+                self.edy[c & (self.ex < 600)] = -600
+            if side == 'r':
+                self.edy[c & (self.ex > 29)] = -600
+
+        resting = self.block(mv, self.ex, self.ey, sprite_size, last_x, last_y, self.edy, 'tblr', 'lr', hit)
+        self.eresting[mv] = resting[mv]
+
+        # freezes the player and itself
+        self.egun_cooldown[atack2] = 6
+        self.freeze_p[atack2] = True
+        self.freeze_e[atack2] = True
+
+        rand = [30,20,10,15,9,25,18,5]
+        rand2 = [1,2,3,4,5,2,4,3]
+        for i in range(8):
+            right = self.edirection > 0
+            x = numpy.where(right, self.ex + i*rand[i], self.ex - i*rand[i] + 46)
+            self.shoot(atack3, x, self.ey + 10 + i*rand2[i], 'bullet2_l.png', numpy.where(right, 1., -1.))
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+        self.egun_cooldown2[m] = numpy.maximum(0, self.egun_cooldown2 - dt)[m]
+
+        c = m & (self.egun_cooldown <= 5)
+        self.freeze_p[c] = False
+        self.freeze_e[c] = False
+
+        self.timeenemy[m & (t == 260)] = 0
+
+
+    def bullet_e1(self, k, j):
+
+        w, h = _image_size('bullet2_l.png')
+        k = self.leave_screen(k, j, w, h)
+        self.b_x[k, j] = _round(self.b_x[:, j] + self.b_direction[:, j] * 300 * dt)[k]
+        c = self.bullet_hit(k, j, w, h, 3)
+        self.b_alive[c, j] = False
+
+
+    # enemy 2, airman
+    def enemy2(self, m):
+
+        t = self.timeenemy
+        atack1 = m & (((t >= 210) & (t <= 250)) | ((t >= 260) & (t <= 300)))
+        atack2 = m & ((t == 210) | (t == 260))
+        atack3 = m & (t > 300)
+        atack4 = m & ((t == 40) | (t == 110) | (t == 180))
+
+        self.timeenemy[m] += 1
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+
+        self.move(atack1, 200)
+        c = atack1 & atack2
+        self.edy[c] = -900
+        self.eresting[c] = False
+
+        self.timeenemy[atack3] = 0
+        self.edirection[atack3] *= -1
+
+        self.contact(m, 1)
+        self.gravity(m)
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy)
+        self.eresting[m] = resting[m]
+
+        self.egun_cooldown[atack4] = 3
+        for i in range(6):
+            self.shoot(atack4, self.ex + 10, self.ey + sprite_size[1], 'torna.png', self.edirection.copy(), 55, i)
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+
+
+    def bullet_e2(self, k, j):
+
+        w, h = _image_size('torna.png')
+        k = self.leave_screen(k, j, w, h)
+        x, y, direction, lifespan = self.b_x[:, j], self.b_y[:, j], self.b_direction[:, j], self.b_lifespan[:, j]
+        n = self.b_n[:, j].astype(int)
+
+        # blows the player forward
+        ax = numpy.array([100,380,440,270,220,300])[n]
+        ay = numpy.array([30,70,120,-40,80,130])[n]
+        early = k & (lifespan > 43)
+        c = early & (direction == -1) & (x >= self.ex - ax)
+        x[c] = _round(x - 1400 * dt)[c]
+        c = early & (direction == 1) & (x <= self.ex + ax)
+        x[c] = _round(x + 1400 * dt)[c]
+        c = early & (y >= self.ey - ay)
+        y[c] = _round(y - 550 * dt)[c]
+
+        c = k & ~early & (lifespan <= 5)
+        x[c] = _round(x + direction * 650 * dt)[c]
+        self.px[c] = numpy.clip(_round(self.px + direction * 150 * dt), 60, 620)[c]
+
+        lifespan[k] -= 1
+        self.bullet_hit(k, j, w, h, 1)
+        self.destroy_player_bullets(k, j, w, h)
+
+
+    # enemy 3, woodman
+    def enemy3(self, m):
+
+        t = self.timeenemy
+        atack1 = m & (t >= 120) & (t <= 140)
+        atack2 = m & (t == 130)
+        atack3 = m & (t > 140)
+        atack4 = m & (t == 30)
+
+        self.timeenemy[m] += 1
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+
+        self.move(atack1, 180)
+        c = atack1 & atack2 & self.eresting
+        self.edy[c] = -700
+        self.eresting[c] = False
+
+        self.timeenemy[atack3] = 20
+        self.face_player(atack3)
+
+        self.contact(m, 1, 50)
+        self.gravity(m)
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy)
+        self.eresting[m] = resting[m]
+
+        # leaves from the enemy, and falls from the top
+        self.egun_cooldown[atack4] = 3
+        right = self.edirection > 0
+        ay = [-10,-10,20,-45]
+        for i in range(4):
+            x = numpy.where(right, self.ex + [-24,50,1,1][i], self.ex - [25,-50,-7,-7][i])
+            self.shoot(atack4, x, self.ey - ay[i], 'met.png', numpy.where(right, 1., -1.), 100, 0, 0)
+        for i in range(4):
+            self.shoot(atack4, 100 + 150*i, 100, 'met.png', 1., 100, 0, 1)
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+
+
+    def bullet_e3(self, k, j):
+
+        w, h = _image_size('met.png')
+        x, y, direction, lifespan = self.b_x[:, j], self.b_y[:, j], self.b_direction[:, j], self.b_lifespan[:, j]
+        swingtime = self.b_aux[:, j]
+
+        lifespan[k] -= 1
+        k = self.leave_screen(k, j, w, h)
+
+        c = k & (self.b_kind[:, j] == 0) & (lifespan <= 50)
+        x[c] = _round(x + direction * 550 * dt)[c]
+
+        c = k & (self.b_kind[:, j] == 1) & (lifespan <= 60)
+        y[c] = _round(y + 300 * dt)[c]
+        swingtime[c] += 1
+        c &= swingtime == 10
+        x[c] = _round(x + direction * 1000 * dt)[c]
+        direction[c] *= -1
+        swingtime[c] = 0
+
+        self.bullet_hit(k, j, w, h, 1, 100)
+        self.destroy_player_bullets(k, j, w, h)
+
+
+    # enemy 4, heatman
+    def enemy4(self, m):
+
+        t = self.timeenemy
+        atack1 = m & (t == 2)
+        atack2 = m & (t > 50)
+        atack3 = m & (t == 3)
+        atack4 = m & (self.fireflash >= 1) & (self.fireflash <= 40)
+
+        self.timeenemy[m] += 1
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+
+        c = m & self.patacked & (self.fireflash == 0)
+        self.fireflash[c] = 100
+        c = m & ~c
+        self.fireflash[c] = numpy.maximum(0, self.fireflash - 1)[c]
+
+        # runs through the player as a fireball
+        self.move(atack4, 600)
+        self.edirection[atack4 & (self.fireflash == 1)] *= -1
+        self.fireflash[atack4 & _collide(self.ex, self.ey, sprite_size[0], sprite_size[1], self.px, self.py, *sprite_size)] = 0
+
+        c = m & ~atack4 & (self.fireflash == 0)
+        jump = c & atack1 & self.eresting
+        self.edy[jump] = -900
+        self.eresting[jump] = False
+        self.eimune[c] = False
+
+        self.timeenemy[atack2] = 1
+        self.face_player(atack2)
+
+        self.contact(m, 0.3, 50)
+        self.gravity(m)
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy)
+        self.eresting[m] = resting[m]
+
+        self.egun_cooldown[atack3] = 5
+        c = atack3 & (self.fireflash == 0)
+        for i in range(3):
+            self.shoot(c, self.ex.copy(), self.ey.copy(), 'bullet_l.png', self.edirection.copy(), 30, i)
+        self.timeenemy[atack3 & ~c] -= 1
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+
+
+    def bullet_e4(self, k, j):
+
+        w, h = _image_size('bullet_l.png')
+        x, y, direction, lifespan = self.b_x[:, j], self.b_y[:, j], self.b_direction[:, j], self.b_lifespan[:, j]
+        n = self.b_n[:, j].astype(int)
+
+        # goes up, then falls on the player
+        aux_x = numpy.array([50,20,-10])[n]
+        aux_y = numpy.abs(self.px - self.ex) * numpy.array([0.55,0.60,0.65])[n]
+        left = direction == -1
+        right_ = self.px + sprite_size[0]
+
+        c = k & numpy.where(left, x > self.px + aux_x, x < right_ - aux_x)
+        x[c] = _round(x + direction * 650 * dt)[c]
+
+        up = numpy.where(left, x > self.px + aux_y, x < right_ - aux_y - 10)
+        y[k & up] = _round(y - 500 * dt)[k & up]
+        y[k & ~up] = _round(y + 700 * dt)[k & ~up]
+        y[k] = numpy.minimum(410, y)[k]
+
+        lifespan[k & (y == 410)] -= 1
+        c = k & (lifespan < 0)
+        self.b_alive[c, j] = False
+        k &= ~c
+
+        out = k & ((x + w < 1) | (x > 736) | (y < 1) | (y + h > 512))
+        self.b_alive[out, j] = False
+        k &= ~out
+
+        self.bullet_hit(k, j, w, h, 0.3, 100)
+
+
+    # enemy 5, metalman
+    def enemy5(self, m):
+
+        t = self.timeenemy
+        w = sprite_size[0]
+        atack1 = m & self.eresting & (t >= 95) & (t <= 110)
+        atack2 = m & ~self.eresting
+        atack3 = m & (((self.px + w < self.ex) & (numpy.abs(self.px + w - self.ex) <= 50)) |
+                      ((self.ex + w < self.px) & (numpy.abs(self.ex + w - self.px) <= 50)))
+
+        self.timeenemy[m] += 1
+
+        # moving floor, changes the movement direction from time to time
+        cells = [(cell, m & ~((self.px + w < cell[0]) | (self.py + sprite_size[1] < cell[1]) | (self.px > cell[2]) | (self.py > cell[3])))
+                 for cell in self.blockers]
+        for cell, c in cells:
+            if 't' in cell[4]:
+                self.px[c] = _round(self.px + self.direction_floor * 100 * dt)[c]
+                self.px[c & (self.px < 60)] = 61
+                self.px[c & (self.px + w > 665)] = 665 - w
+            self.direction_floor[c & (self.time % 120 == 0)] *= -1
+
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+
+        # jumps to the other side when the player gets too close
+        c = atack3 & self.eresting
+        self.emove[c] = True
+        self.edy[c] = -900
+        self.eresting[c] = False
+
+        self.move(m & self.emove, 900)
+        c = m & self.emove & (self.ex < 200)
+        self.ex[c] = 200
+        self.edirection[c] *= -1
+        self.emove[c] = False
+        c = m & self.emove & (self.ex > 500)
+        self.ex[c] = 500
+        self.edirection[c] *= -1
+        self.emove[c] = False
+
+        c = m & self.eresting & (atack1 | self.patacked)
+        self.edy[c] = -900
+        self.eresting[c] = False
+
+        # releases up to 3 blades (decided randomly) after jumping, and one when the player atacks
+        c = atack2 & (self.egun_cooldown == 0)
+        self.egun_cooldown[c] = 3
+        blades = numpy.zeros(len(m), int)
+        for i in numpy.nonzero(c)[0]:
+            blades[i] = self.rngs[i].integers(1,4)
+        for i in range(3):
+            self.shoot(c & (blades > i), self.ex + self.edirection*(i*30), self.ey + self.edirection*(i*20), 'blade.png', self.edirection.copy())
+        self.timeenemy[c] = 0
+
+        self.shoot(m & self.patacked, self.ex.copy(), self.ey.copy(), 'blade.png', self.edirection.copy())
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+
+        self.contact(m, 0.3, 50)
+        self.gravity(m)
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy)
+        self.eresting[m] = resting[m]
+
+
+    def bullet_e5(self, k, j):
+
+        w, h = _image_size('blade.png')
+        x, y = self.b_x[:, j], self.b_y[:, j]
+
+        # goes the player's direction marked at the shooting time
+        x[k] = _round(x + self.b_direction[:, j] * 550 * dt)[k]
+        c = k & (y + h < self.py + sprite_size[1])
+        y[c] = _round(y + 300 * dt)[c]
+
+        k = self.leave_screen(k, j, w, h)
+        self.bullet_hit(k, j, w, h, 0.3, 100)
+
+
+    # enemy 6, crashman
+    def enemy6(self, m):
+
+        t = self.timeenemy
+        w = sprite_size[0]
+        atack1 = m & (t == 105)
+        atack2 = m & ((numpy.abs(self.ex - self.px) <= 1) | (numpy.abs(self.ex + w - (self.px + w)) <= 1) | (self.edy > 200))
+
+        self.timeenemy[m] += 1
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+
+        c = m & (self.ex < 60)
+        self.edirection[c] *= -1
+        self.ex[c] = 60
+        c = m & (self.ex + w > 680)
+        self.edirection[c] *= -1
+        self.ex[c] = 680 - w
+
+        aux_dist = (numpy.abs(self.px + w - (self.ex + w))/490.0)+0.1
+        c = m & (self.edy < 0)
+        self.ex[c] = _round(self.ex + self.edirection * (1500 * aux_dist) * dt)[c]
+        self.move(m & ~c, 180)
+
+        # jumps towards the player
+        c = m & self.eresting & (atack1 | self.patacked)
+        self.face_player(c, False)
+        self.timeenemy[c] = 0
+        self.edy[c] = (-1500 * aux_dist)[c]
+        self.eresting[c] = False
+
+        c = m & ~self.eresting & ~self.just_shoot & atack2
+        self.egun_cooldown[c] = 3
+        self.just_shoot[c] = True
+        self.shoot(c, self.ex.copy(), self.ey.copy(), 'mi2.png', self.edirection.copy(), 70)
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+
+        self.contact(m, 0.3, 50)
+        self.gravity(m)
+
+        def hit(side, c):
+            if side == 't':
+                self.just_shoot[c] = False
+
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy, hit=hit)
+        self.eresting[m] = resting[m]
+
+
+    def bullet_e6(self, k, j):
+
+        w, h = _image_size('mi2.png')
+        y, lifespan = self.b_y[:, j], self.b_lifespan[:, j]
+
+        y[k] = numpy.minimum(410, _round(y + 500 * dt))[k]
+        lifespan[k] -= 1
+        c = k & (lifespan < 0)
+        self.b_alive[c, j] = False
+
+        self.bullet_hit(k & ~c, j, w, h, 0.3, 100)
+
+
+    # enemy 7, bubbleman
+    def enemy7(self, m):
+
+        t = self.timeenemy
+        w = sprite_size[0]
+        atack1 = m & (t >= 4) & (t <= 20) & (t % 4 == 0)
+        atack3 = m & (t == 5)
+        atack4 = m & (t >= 50) & (t < 80)
+        atack5 = m & (t == 50)
+        atack6 = m & (t == 100)
+
+        self.timeenemy[m] += 1
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+        aux_dist = (numpy.abs(self.px + w - (self.ex + w))/490.0)+0.3
+
+        self.egun_cooldown2[atack1] = 3
+        for i in numpy.nonzero(atack1)[0]:
+            self.rngs[i].integers(0, 25, 1)
+        self.shoot(atack1, self.ex.copy(), self.ey.copy(), 'bullet2_l.png', self.edirection.copy(), 0, 0, 0)
+
+        # bubbles, only when the last ones have gone away
+        c = m & (self.ebullets == 0) & atack3
+        for i in range(2):
+            self.egun_cooldown[c] = 3
+            self.ebullets[c] += 1
+            self.shoot(c, self.ex + self.edirection*i*30, self.ey - i*30, 'bubb.png', self.edirection.copy(), 0, 0, 1, 1)
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+        self.egun_cooldown2[m] = numpy.maximum(0, self.egun_cooldown2 - dt)[m]
+
+        self.ex[atack4] = _round(self.ex + self.edirection * 600 * aux_dist * dt * 0.7)[atack4]
+
+        c = m & self.eresting & atack5
+        self.edy[c] = -1500
+        self.eresting[c] = False
+
+        self.face_player(atack6)
+        self.timeenemy[atack6] = 0
+
+        self.gravity(m, 0.4)
+
+        c = self.contact(m, 0.3, 50)
+        self.ex[c] = numpy.clip(self.ex, 70, 610)[c]
+
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy)
+        self.eresting[m] = resting[m]
+
+
+    def bullet_e7(self, k, j):
+
+        x, y, direction = self.b_x[:, j], self.b_y[:, j], self.b_direction[:, j]
+        bubble = self.b_kind[:, j] == 1
+
+        # bullets
+        c = k & ~bubble
+        w, h = _image_size('bullet2_l.png')
+        x[c] = _round(x + direction * 500 * dt)[c]
+        c = self.leave_screen(c, j, w, h)
+        self.bullet_hit(c, j, w, h, 0.3, 100)
+
+        # bubbles, going up and down
+        c = k & bubble
+        direc = self.b_aux[:, j]
+        w, h = _image_size('bubb.png')
+        x[c] = _round(x + direction * 200 * dt * 0.5)[c]
+        y[c] = _round(y + 200 * direc * dt * 0.4)[c]
+        direc[c & ((y >= 460) | (y <= 350))] *= -1
+        out = c & ~self.leave_screen(c, j, w, h)
+        self.ebullets[out] -= 1
+        self.bullet_hit(c & ~out, j, w, h, 0.3, 100)
+
+
+    # enemy 8, quickman
+    def enemy8(self, m):
+
+        t = self.timeenemy
+        w = sprite_size[0]
+        atack1 = m & (((t >= 1) & (t < 10)) | ((t >= 20) & (t < 30)))
+        atack2 = m & ((t == 1) | (t == 20))
+        atack3 = m & ((t == 9) | (t == 29))
+        atack4 = m & ~atack1 & (t >= 40) & (t < 50)
+        atack5 = m & ~atack1 & ~atack4 & (t == 50)
+        atack6 = m & ((numpy.abs(self.ex - self.px) <= 200) | (numpy.abs(self.ex + w - (self.px + w)) <= 200)) & (self.egun_cooldown == 0)
+
+        self.timeenemy[m] += 1
+        last_x, last_y = self.ex.copy(), self.ey.copy()
+
+        self.move(atack1, 730)
+        c = atack1 & self.eresting & atack2
+        self.edy[c] = -900
+        self.eresting[c] = False
+        self.face_player(atack1 & atack3)
+
+        self.move(atack4, 900)
+        self.timeenemy[atack5] = 0
+
+        # the bullets take the direction of the enemy as their number, and the reverse
+        c = m & ~self.eresting & ~self.just_shoot & atack6
+        self.egun_cooldown[c] = 5
+        self.just_shoot[c] = True
+        for i in range(3):
+            self.shoot(c, self.ex + i*60, self.ey.copy(), 'bullet2_l.png', float(i), 70, self.edirection.copy())
+
+        self.egun_cooldown[m] = numpy.maximum(0, self.egun_cooldown - dt)[m]
+
+        self.contact(m, 0.3)
+        self.gravity(m)
+
+        def hit(side, c):
+            if side == 't':
+                self.just_shoot[c] = False
+
+        resting = self.block(m, self.ex, self.ey, sprite_size, last_x, last_y, self.edy, 'tblr', 'lr', hit)
+        self.eresting[m] = resting[m]
+
+
+    def bullet_e8(self, k, j):
+
+        w, h = _image_size('bullet2_l.png')
+        x, y, lifespan = self.b_x[:, j], self.b_y[:, j], self.b_lifespan[:, j]
+
+        lifespan[k] -= 1
+        c = k & (lifespan < 40)
+        y[c] = _round(y - 700 * dt)[c]
+        c = k & ~c
+        y[c] = numpy.minimum(410, _round(y + 500 * dt))[c]
+
+        # follows the player
+        c = k & ~((numpy.abs(x - self.px) <= 10) | (numpy.abs(x + w - (self.px + sprite_size[0])) <= 10))
+        left = c & (self.px < x)
+        x[left] = _round(x - 400 * dt)[left]
+        x[c & ~left] = _round(x + 400 * dt)[c & ~left]
+
+        k = self.leave_screen(k, j, w, h)
+        self.bullet_hit(k, j, w, h, 0.3)
+
+
+    # gets the actions of the players of every game
+    def control(self, sensors, pconts, running):
+
+        if hasattr(self.player_controller, 'control_batch'):
+            return self.player_controller.control_batch(sensors, pconts)
+
+        actions = numpy.zeros((len(sensors), 5), int)
+        for i in numpy.nonzero(running)[0]:
+            actions[i] = self.player_controller.control(sensors[i], pconts[i])
+        return actions
+
+
+    # plays the games of a batch of controllers against one enemy
+    def run(self, enemyn, pconts, seeds):
+
+        sensors = self.reset(enemyn, seeds)
+        while not self.done.all():
+            sensors = self.step(self.control(sensors, pconts, ~self.done))[0]
+
+        return [(self.fitness[i], self.plife[i], self.elife[i], self.time[i]) for i in range(len(pconts))]
+
+
+    # plays every controller in the list, n games at a time, returning results in order
+    def play(self, pconts, econt="None", seeds=None):
+
+        if seeds is None:
+            seeds = [None] * len(pconts)
+        seeds = [self.get_seed(seed) for seed in seeds]
+
+        results = []
+        for b in range(0, len(pconts), self.n):
+            batch = pconts[b:b+self.n]
+            batch_seeds = seeds[b:b+self.n]
+
+            if self.multiplemode == "yes":
+                runs = [self.run(e, batch, batch_seeds) for e in self.enemies]
+
+                # consolidates the results of every game among the enemies
+                for game in zip(*runs):
+                    results.append(tuple(self.cons_multi(numpy.array(values)) for values in zip(*game)))
+            else:
+                results += self.run(self.enemies[0], batch, batch_seeds)
+
+        return results
+
+
+    def cons_multi(self, values):
+        return values.mean() - values.std()
+
+
+# plays the same games on the kernel and on the reference Environment, n at a time, comparing
+# the sensors, lives, time and fitness after every decision of the players. the actions come
+# from the player controller of the parameters when pconts are given, else they are random.
+# returns None when both agree, or a description of the first difference.
+def verify(n, pconts=None, seeds=None, **params):
+
+    from environment import Environment
+
+    params['render'] = "none"
+    kernel = Kernel(n, **params)
+    envs = [Environment(**params) for i in range(n)]
+
+    if seeds is None:
+        seeds = list(range(n))
+    rng = numpy.random.default_rng(0)
+
+    for enemy in kernel.enemies:
+        sensors = kernel.reset(enemy, seeds)
+        expected = [env.reset(enemy, seed) for env, seed in zip(envs, seeds)]
+        running = numpy.ones(n, bool)
+        decision = 0
+
+        while 1:
+            for i in numpy.nonzero(running)[0]:
+                env = envs[i]
+                values = numpy.zeros(max(sensors.shape[1], len(expected[i])))
+                values[:len(expected[i])] = expected[i]
+                got = ([float(v) for v in sensors[i]], float(kernel.plife[i]), float(kernel.elife[i]), int(kernel.time[i]), bool(kernel.done[i]))
+                wanted = ([float(v) for v in values], float(env.player.life), float(env.enemy.life), env.time, env.step_result is not None)
+                if got != wanted:
+                    return ("enemy "+str(enemy)+", seed "+str(seeds[i])+", decision "+str(decision)+
+                            ": kernel "+str(got)+", environment "+str(wanted))
+
+                if env.step_result is not None and kernel.fitness[i] != env.step_result[0]:
+                    return "enemy "+str(enemy)+", seed "+str(seeds[i])+": fitness "+str(kernel.fitness[i])+", environment "+str(env.step_result[0])
+
+            running = ~kernel.done
+            if not running.any():
+                break
+
+            if pconts is None:
+                actions = rng.integers(0, 2, (n, 5))
+            else:
+                actions = kernel.control(sensors, pconts, running)
+
+            sensors = kernel.step(actions)[0]
+            for i in numpy.nonzero(running)[0]:
+                expected[i] = envs[i].step(actions[i])[0]
+            decision += 1
+
+    return None
@@ -0,0 +1,111 @@
+import os
+import atexit
+import threading
+import multiprocessing.util
+
+
+# messages are kept in memory and written by a background thread, once enough of them are waiting
+# or some time has passed since they were logged, so logging a message never opens the log file.
+# every process has its own writers: a forked process drops the messages of its parent.
+class LogWriter(object):
+
+
+    # path: file the messages are appended to, size: bytes waiting that trigger a write,
+    # interval: seconds after which waiting messages are written anyway
+    def __init__(self, path, size=65536, interval=1.0):
+
+        self.path = path
+        self.size = size
+        self.interval = interval
+        self.buffer = []
+        self.buffered = 0
+        self.lock = threading.Lock()   # guards the waiting messages, never held while the file is open
+        self.file_lock = threading.Lock()   # keeps writes to the file in order
+        self.wake = threading.Event()
+        self.thread = None
+
+
+    # adds a message to the ones waiting to be written
+    def write(self, text):
+
+        with self.lock:
+            self.buffer.append(text)
+            self.buffered += len(text)
+            full = self.buffered >= self.size
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='evoman-logs')
+            self.thread.daemon = True
+            self.thread.start()
+        if full:
+            self.wake.set()
+
+
+    # writes the waiting messages
+    def flush(self):
+
+        with self.file_lock:
+            with self.lock:
+                if not self.buffer:
+                    return
+                buffer = self.buffer
+                self.buffer = []
+                self.buffered = 0
+
+            # messages logged meanwhile wait for the next write
+            file_aux = open(self.path, 'a')
+            file_aux.write(''.join(buffer))
+            file_aux.close()
+
+
+    # empties the log file, dropping the messages not written yet
+    def truncate(self):
+
+        with self.file_lock:
+            with self.lock:
+                self.buffer = []
+                self.buffered = 0
+
+            file_aux = open(self.path, 'w')
+            file_aux.close()
+
+
+    # background thread writing the messages
+    def run(self):
+
+        while 1:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.flush()
+
+
+
+# writers of this process, keyed by file
+_writers = {}
+
+# gets the writer of a log file
+def writer(path):
+
+    log = _writers.get(path)
+    if log is None:
+        # worker processes skip atexit and forget the finalizers of their parent, so every
+        # process asks multiprocessing to write its messages when it ends
+        if not _writers:
+            multiprocessing.util.Finalize(None, flush_all, exitpriority=0)
+        log = _writers.setdefault(path, LogWriter(path))
+    return log
+
+# writes the waiting messages of every log file
+def flush_all():
+
+    for log in list(_writers.values()):
+        log.flush()
+
+# the threads of the parent do not exist in a forked process, neither should its messages
+def _forget_writers():
+    _writers.clear()
+
+# messages are written when the program ends
+atexit.register(flush_all)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_writers)
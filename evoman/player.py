@@ -12,27 +12,28 @@ import binascii
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import loadImage
 from sensors import *
+from bullet_pool import BulletPool
 
 
 # player proctile
 class Bullet_p(pygame.sprite.Sprite):
 
 
-    image = pygame.image.load('evoman/images/bullet_r.png')
+    image = loadImage('evoman/images/bullet_r.png')
 
-    def __init__(self, location, direction, n_twist, *groups):
+    def __init__(self, location, direction, *groups):
         super(Bullet_p, self).__init__(*groups)
         self.rect = pygame.rect.Rect(location, self.image.get_size())
         self.direction = direction
 
-        self.n_twist = n_twist
 
         # fits image according to the side the player is turned to
         if self.direction == 1:
-            self.image = pygame.image.load('evoman/images/bullet_r.png')
+            self.image = loadImage('evoman/images/bullet_r.png')
         else:
-            self.image = pygame.image.load('evoman/images/bullet_l.png')
+            self.image = loadImage('evoman/images/bullet_l.png')
 
 
 
@@ -41,7 +42,7 @@ class Bullet_p(pygame.sprite.Sprite):
         # removes bullets objetcs when they transpass the screen limits
         if self.rect.right<1 or self.rect.left>736 or  self.rect.top <1 or self.rect.bottom>512 :
             self.kill()
-            game.player.twists[self.n_twist] = None
+            game.player.twists.remove(self)
             return
 
         self.rect.x += self.direction * 600 * dt    # moving on the X axis (left or tight). It adds 600*dt forward at each general game loop loop iteration, where dt controls the frames limit.
@@ -61,7 +62,7 @@ class Bullet_p(pygame.sprite.Sprite):
 
             # removes the bullet off the screen after collision.
             self.kill()
-            game.player.twists[self.n_twist] = None
+            game.player.twists.remove(self)
 
             game.enemy.hurt = 5
 
@@ -92,11 +93,13 @@ class Player(pygame.sprite.Sprite):
         self.hurt = 0
         self.shooting = 0
         self.inwater = 0
-        self.twists = []
+        self.twists = BulletPool()
         self.vx = 0
         self.vy = 0
         self.hy = 0
         self.sensors = None
+        self.actions = None   # last actions decided by the controller
+        self.repeat = 0   # frames the last actions are still going to be repeated
 
 
 
@@ -118,7 +121,7 @@ class Player(pygame.sprite.Sprite):
 
             # defines game mode for player action
 
-            if game.playermode == 'human': # player controlled by keyboard/joystick
+            if game.config.human: # player controlled by keyboard/joystick
 
                 # if joystick is connected, initializes it.
                 if game.joy > 0:
@@ -175,11 +178,26 @@ class Player(pygame.sprite.Sprite):
                 if key[pygame.K_LSHIFT] and press == 1:
                     shoot = 1
 
-            elif game.playermode == 'ai': # player controlled by AI algorithm
+            else: # player controlled by AI algorithm
 
 
-                # calls the controller providing game sensors
-                actions = game.player_controller.control(self.sensors.get(game), game.pcont)
+                # repeats the last actions during 'action repeat' frames, then uses the actions fed by
+                # the environment (e.g. computed for a batch of games) or calls the controller providing game sensors
+                if self.repeat > 0:
+                    self.repeat -= 1
+                    actions = self.actions
+                else:
+                    if game.player_actions is not None:
+                        actions = game.player_actions
+                    else:
+                        game.enter('sensors')
+                        sensors = self.sensors.read(game)
+                        game.leave()
+                        game.enter('control')
+                        actions = game.player_controller.control(sensors, game.pcont)
+                        game.leave()
+                    self.actions = actions
+                    self.repeat = game.action_repeat - 1
                 if len(actions) < 5:
                     game.print_logs("ERROR: Player controller must return 5 decision variables.")
                     sys.exit(0)
@@ -289,15 +307,15 @@ class Player(pygame.sprite.Sprite):
 
                 # creates bullets objects according to the direction.
                 if self.direction > 0:
-                    self.twists.append(Bullet_p(self.rect.midright, 1, len(self.twists), game.sprite_p))
+                    self.twists.shoot(Bullet_p, self.rect.midright, 1, game.sprite_p)
 
                 else:
-                     self.twists.append(Bullet_p(self.rect.midleft, -1, len(self.twists), game.sprite_p))
+                     self.twists.shoot(Bullet_p, self.rect.midleft, -1, game.sprite_p)
 
                 self.gun_cooldown = 0.4 # marks time to the bullet for allowing next bullets
 
                 # sound effects
-                if game.sound == "on" and game.playermode == "human":
+                if game.config.sound and game.config.human:
                     sound = pygame.mixer.Sound('evoman/sounds/scifi003.wav')
                     c = pygame.mixer.Channel(2)
                     c.set_volume(1)
@@ -0,0 +1,105 @@
+import sys
+import numpy
+
+from environment import Environment
+
+
+# evaluates a batch of controllers by following the tree (trie) of the actions they take. games
+# are deterministic given the seed and the actions, so controllers taking the same actions share
+# the frames played until their actions differ. at that point the game is snapshotted, and each
+# group of controllers taking the same actions continues from the snapshot. controllers must
+# decide their actions from the sensors only (no internal state or randomness).
+class PrefixEnvironment(object):
+
+
+    # the parameters are the ones of Environment
+    def __init__(self, **params):
+
+        # games are never drawn
+        params['render'] = "none"
+
+        self.env = Environment(**params)
+        self.player_controller = self.env.player_controller
+        self.frames = 0   # frames played by the last call to play
+
+        if self.env.playermode != "ai":
+            self.env.print_logs("ERROR: 'player mode' must be 'ai' for prefix environments.")
+            sys.exit(0)
+
+
+    # method for updating simulation parameters
+    def update_parameter(self, name, value):
+
+        self.env.update_parameter(name, value)
+
+        if name == 'player_controller':
+            self.player_controller = value
+
+
+    # gets the actions of the controllers in the group, which all see the same sensors
+    def control(self, sensors, pconts, group):
+
+        if len(group) > 1 and hasattr(self.player_controller, 'control_batch'):
+            return list(self.player_controller.control_batch(numpy.tile(sensors, (len(group), 1)), [pconts[i] for i in group]))
+
+        return [self.player_controller.control(sensors, pconts[i]) for i in group]
+
+
+    # plays every controller against one enemy, returning their results in order
+    def run_trie(self, enemyn, pconts, econt, seed):
+
+        env = self.env
+        results = [None] * len(pconts)
+
+        sensors = env.reset(enemyn, seed, econt)
+        self.frames += env.time
+
+        # branches still to be played: snapshot to start from, sensors, controllers and their actions
+        branches = [(None, sensors, list(range(len(pconts))), None)]
+
+        while branches:
+            snap, sensors, group, action = branches.pop()
+            if snap is not None:
+                env.restore(snap)
+
+            while 1:
+
+                # groups the controllers by the actions they take
+                if action is None:
+                    actions = {}
+                    for i, a in zip(group, self.control(sensors, pconts, group)):
+                        actions.setdefault(tuple(int(x) for x in a), []).append(i)
+
+                    groups = list(actions.items())
+                    if len(groups) > 1:
+                        snap = env.snapshot()
+                        for a, g in groups[1:]:
+                            branches.append((snap, sensors, g, list(a)))
+                    action, group = list(groups[0][0]), groups[0][1]
+
+                time = env.time
+                sensors, reward, done, info = env.step(action)
+                self.frames += env.time - time
+                action = None
+
+                if done:
+                    for i in group:
+                        results[i] = (info['fitness'], info['player_life'], info['enemy_life'], info['time'])
+                    break
+
+        return results
+
+
+    # plays every controller in the list with the same seed, returning results in order
+    def play(self, pconts, econt="None", seed=None):
+
+        seed = self.env.get_seed(seed)
+        self.frames = 0
+
+        if self.env.multiplemode == "yes":
+            runs = [self.run_trie(e, pconts, econt, seed) for e in self.env.enemies]
+
+            # consolidates the results of every controller among the enemies
+            return [tuple(self.env.cons_multi(numpy.array(values)) for values in zip(*game)) for game in zip(*runs)]
+
+        return self.run_trie(self.env.enemies[0], pconts, econt, seed)
@@ -1,49 +1,89 @@
 import numpy
-import struct
-import binascii
 
-# sensors for the controllers
+# sensors for the controllers: horizontal and vertical distances from the player to the enemy, the
+# directions of both, then the distances from the player to each enemy bullet (in shooting order),
+# padded with zeros up to 8 bullets.
 class Sensors():
 
 
-    def get(self, game):
+    def __init__(self):
 
+        self.buffer = numpy.zeros(20)   # reused by every reading, grows when more than 8 bullets are on the screen
+        self.coded = numpy.zeros(20, numpy.int64)   # integer sensors, read as bytes when inputs are coded
+        self.sensors = self.buffer
 
-        # calculates vertical and horizontal distances between sprites centers
 
-        posx_p = game.player.rect.left +((game.player.rect.right - game.player.rect.left)/2)
-        posy_p = game.player.rect.bottom +((game.player.rect.top - game.player.rect.bottom)/2)
-        posx_e = game.enemy.rect.left +((game.enemy.rect.right - game.enemy.rect.left)/2)
-        posy_e = game.enemy.rect.bottom +((game.enemy.rect.top - game.enemy.rect.bottom)/2)
+    # writes the sensors of the game into the buffer, returning the part of the buffer holding them.
+    # the values are only valid until the next reading.
+    def read(self, game):
 
-        param_values = [ posx_p-posx_e, posy_p-posy_e, game.player.direction, game.enemy.direction]
+        param_values = _values(game)
+        n = max(20, len(param_values))
+        if len(self.buffer) < n:
+            self.buffer = numpy.zeros(n)
 
-        # calculates vertical and horizontal distances between player and the center of enemy's bullets
-        for i in range(0,len(game.enemy.twists)):
-            if game.enemy.twists[i] != None:
-                posx_be = game.enemy.twists[i].rect.left +((game.enemy.twists[i].rect.right - game.enemy.twists[i].rect.left)/2)
-                posy_be = game.enemy.twists[i].rect.bottom +((game.enemy.twists[i].rect.top - game.enemy.twists[i].rect.bottom)/2)
-                param_values.append(posx_p-posx_be)
-                param_values.append(posy_p-posy_be)
+        values = self.buffer[:n]
+        values[:len(param_values)] = param_values
 
         # treats cases when not all bullets are used
-        for i in range(0,8-len([t for t in game.enemy.twists if t != None])):
-            param_values.append(0)
-            param_values.append(0)
+        values[len(param_values):] = 0
+
+        # codes the sensors as the bytes of their integer values
+        if game.config.inputs_coded:
+            if len(self.coded) != n:
+                self.coded = numpy.zeros(n, numpy.int64)
+            self.coded[:] = values
+            values = self.coded.view(numpy.uint8)
+
+        self.sensors = values # defines sensors state
+        return values
+
+
+    # returns a new array with the sensors of the game
+    def get(self, game):
+
+        return self.read(game).copy()
+
+
+
+# sensors of a game, without the padding of unused bullets
+def _values(game):
+
+    # calculates vertical and horizontal distances between sprites centers
+    player = game.player.rect
+    enemy = game.enemy.rect
+    posx_p = player.left +((player.right - player.left)/2)
+    posy_p = player.bottom +((player.top - player.bottom)/2)
+    posx_e = enemy.left +((enemy.right - enemy.left)/2)
+    posy_e = enemy.bottom +((enemy.top - enemy.bottom)/2)
+
+    param_values = [posx_p-posx_e, posy_p-posy_e, game.player.direction, game.enemy.direction]
+
+    # calculates vertical and horizontal distances between player and the center of enemy's bullets
+    for bullet in game.enemy.twists.bullets:
+        rect = bullet.rect
+        param_values.append(posx_p - (rect.left +((rect.right - rect.left)/2)))
+        param_values.append(posy_p - (rect.bottom +((rect.top - rect.bottom)/2)))
+
+    return param_values
 
-        # applies several transformations to input variables (sensors)
-        if game.inputscoded == "yes":
 
-            types = struct.Struct('q q q q q q q q q q q q q q q q q q q q') # defines the data types of each item of the array that will be packed. (q=int, f=flo)
-            packed_data = types.pack(*param_values)  # packs data as struct
-            coded_variables =  binascii.hexlify(packed_data)  # converts packed data to an hexadecimal string
-            coded_variables = [coded_variables[i:i+2] for i in range(0, len(coded_variables), 2)] # breaks hexadecimal string in bytes.
-            coded_variables = numpy.array(map(lambda y: int(y, 16), coded_variables))  # converts bytes to integer
+# writes the sensors of several games into the rows of out, the ones of games[k] into the row
+# rows[k] (row k when rows is not given). returns out.
+def get_batch(games, out, rows=None):
 
-            param_values = coded_variables
+    if rows is None:
+        rows = range(len(games))
 
+    for game, row in zip(games, rows):
 
-        self.sensors = param_values # defines sensors state
+        # coded inputs have their own layout
+        if game.config.inputs_coded:
+            out[row] = game.player.sensors.read(game)
+            continue
 
+        param_values = _values(game)
+        out[row, :len(param_values)] = param_values
+        out[row, len(param_values):] = 0
 
-        return numpy.array(self.sensors)
+    return out
@@ -7,6 +7,7 @@
 # Added selective area support SpriteLayer.draw
 
 import sys
+import copy
 import struct
 import pygame
 from pygame.locals import *
@@ -215,7 +216,14 @@ class Layer(object):
        layer[x, y] is layer.cells[x, y]
 
     Note that empty cells will be set to None instead of a Cell instance.
+
+    The cells seen through a viewport are rendered once to a background Surface
+    which is then drawn with a single blit for as long as the view does not
+    move. Copies of a Layer share its cells, and so its backgrounds too.
     '''
+    # number of viewport positions whose backgrounds are kept
+    max_backgrounds = 16
+
     def __init__(self, name, visible, map):
         self.name = name
         self.visible = visible
@@ -231,6 +239,7 @@ class Layer(object):
         self.group = pygame.sprite.Group()
         self.properties = {}
         self.cells = {}
+        self.backgrounds = {}
 
     def __repr__(self):
         return '<Layer "%s" at 0x%x>' % (self.name, id(self))
@@ -243,6 +252,7 @@ class Layer(object):
         px = x * self.tile_width
         py = y * self.tile_width
         self.cells[pos] = Cell(x, y, px, py, tile)
+        self.backgrounds.clear()
 
     def __iter__(self):
         return LayerIterator(self)
@@ -283,8 +293,24 @@ class Layer(object):
     def draw(self, surface):
         '''Draw this layer, limited to the current viewport, to the Surface.
         '''
+        key = self.position + (self.view_w, self.view_h)
+        background = self.backgrounds.get(key)
+        if background is None:
+            background = self.render()
+            if len(self.backgrounds) >= self.max_backgrounds:
+                del self.backgrounds[next(iter(self.backgrounds))]
+            self.backgrounds[key] = background
+        surface.blit(background, (0, 0))
+
+    def render(self):
+        '''Return a transparent Surface with the cells of the current viewport
+        drawn on it, as they are drawn to the screen.
+        '''
         ox, oy = self.position
         w, h = self.view_w, self.view_h
+        # the last row and column of cells may reach past the viewport
+        background = pygame.Surface((w + 2 * self.tile_width,
+            h + 2 * self.tile_height), pygame.SRCALPHA)
         for x in range(ox, ox + w + self.tile_width, self.tile_width):
             i = x // self.tile_width
             for y in range(oy, oy + h + self.tile_height, self.tile_height):
@@ -292,7 +318,8 @@ class Layer(object):
                 if (i, j) not in self.cells:
                     continue
                 cell = self.cells[i, j]
-                surface.blit(cell.tile.surface, (cell.px - ox, cell.py - oy))
+                background.blit(cell.tile.surface, (cell.px - ox, cell.py - oy))
+        return background
 
     def find(self, *properties):
         '''Find all cells with the given properties set.
@@ -706,6 +733,26 @@ class TileMap(object):
             if layer.visible:
                 layer.draw(screen)
 
+    def copy(self):
+        '''Return a new TileMap sharing the tilesets and cells of this one.
+
+        The copy has its own Layers and viewport, so SpriteLayers may be added
+        to it and its focus set without touching this TileMap. Loading a map
+        once and copying it avoids parsing the TMX file again.
+        '''
+        tilemap = TileMap((self.view_w, self.view_h), (self.view_x, self.view_y))
+        tilemap.width = self.width
+        tilemap.height = self.height
+        tilemap.tile_width = self.tile_width
+        tilemap.tile_height = self.tile_height
+        tilemap.px_width = self.px_width
+        tilemap.px_height = self.px_height
+        tilemap.properties = self.properties
+        tilemap.tilesets = self.tilesets
+        for layer in self.layers:
+            tilemap.layers.add_named(copy.copy(layer), layer.name)
+        return tilemap
+
     @classmethod
     def load(cls, filename, viewport):
         with open(filename) as f:
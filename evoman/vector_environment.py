@@ -0,0 +1,134 @@
+import sys
+import numpy
+
+from environment import Environment
+from sensors import get_batch
+
+
+# runs several independent games in lockstep inside one process. at every frame the sensors
+# of all games are gathered into one array and the player controller is called once for the
+# whole batch, if it implements control_batch(inputs, controllers).
+class VectorEnvironment(object):
+
+
+    # n: number of games stepped together, the remaining parameters are the ones of Environment
+    def __init__(self, n, **params):
+
+        # games are never drawn, all of them share the same display
+        params['render'] = "none"
+
+        # results are looked up in the cache here, not by every game
+        self.cache = params.pop('cache', None)
+
+        self.n = n
+        self.envs = [Environment(**params) for i in range(n)]
+        self.player_controller = self.envs[0].player_controller
+
+        if self.envs[0].playermode != "ai":
+            self.envs[0].print_logs("ERROR: 'player mode' must be 'ai' for vectorized environments.")
+            sys.exit(0)
+
+
+    # method for updating simulation parameters of all games
+    def update_parameter(self, name, value):
+
+        for env in self.envs:
+            env.update_parameter(name, value)
+
+        if name == 'player_controller':
+            self.player_controller = value
+
+
+    # gets the actions of every game in the batch
+    def control(self, sensors, pconts, deciding):
+
+        if hasattr(self.player_controller, 'control_batch'):
+            return self.player_controller.control_batch(sensors, pconts)
+
+        # controllers without batch support are called game by game
+        actions = [None] * len(sensors)
+        for i in deciding:
+            actions[i] = self.envs[i].player_controller.control(sensors[i], pconts[i])
+        return actions
+
+
+    # runs the games of a batch of controllers against one enemy
+    def run_lockstep(self, enemyn, pconts, econt, seeds):
+
+        envs = self.envs[:len(pconts)]
+        for env, pcont, seed in zip(envs, pconts, seeds):
+            env.start_run(enemyn, pcont, econt, seed)
+
+        results = [None] * len(envs)
+        running = list(range(len(envs)))
+        sensors = numpy.zeros((len(envs), envs[0].get_num_sensors()))
+
+        # game main loop
+        while running:
+
+            # updates every game up to the moment its player decides the actions
+            deciding = []
+            for i in list(running):
+                if not envs[i].start_frame():
+                    running.remove(i)
+                elif envs[i].player_decides():
+                    deciding.append(i)
+
+            # gets the actions of all deciding players at once
+            if deciding:
+                get_batch([envs[i] for i in deciding], sensors, deciding)
+                actions = self.control(sensors, pconts, deciding)
+
+            for i in deciding:
+                envs[i].player_actions = actions[i]
+
+            # finishes the frame of every game
+            for i in list(running):
+                results[i] = envs[i].finish_frame()
+                envs[i].player_actions = None
+                if results[i] is not None:
+                    running.remove(i)
+
+        return results
+
+
+    # plays every controller in the list, n games at a time, returning results in order
+    def play(self, pconts, econt="None", seeds=None):
+
+        # seeds are decided like Environment.play_many does, so both give the same results
+        if seeds is None:
+            seeds = [None] * len(pconts)
+        seeds = [self.envs[0].get_seed(seed) for seed in seeds]
+
+        # only runs missing in the cache are played
+        if self.cache is not None:
+            keys = [self.cache.key(self.envs[0], pcont, econt, seed) for pcont, seed in zip(pconts, seeds)]
+            cached = [self.cache.get(key) for key in keys]
+            missing = [i for i, result in enumerate(cached) if result is None]
+            played = self.play_batches([pconts[i] for i in missing], econt, [seeds[i] for i in missing])
+            for i, result in zip(missing, played):
+                cached[i] = result
+                self.cache.put(keys[i], result)
+            return cached
+
+        return self.play_batches(pconts, econt, seeds)
+
+
+    # plays the controllers n games at a time
+    def play_batches(self, pconts, econt, seeds):
+
+        results = []
+        for b in range(0, len(pconts), self.n):
+            batch = pconts[b:b+self.n]
+            batch_seeds = seeds[b:b+self.n]
+
+            if self.envs[0].multiplemode == "yes":
+                runs = [self.run_lockstep(e, batch, econt, batch_seeds) for e in self.envs[0].enemies]
+
+                # consolidates the results of every game among the enemies
+                for game in zip(*runs):
+                    results.append(tuple(self.envs[0].cons_multi(numpy.array(values)) for values in zip(*game)))
+            else:
+                results += self.run_lockstep(self.envs[0].enemies[0], batch, econt, batch_seeds)
+
+        return results
@@ -23,7 +23,7 @@ import sys, os
 import configparser
 from time import time
 
-# Comment this out to show the game window
+# Comment this out (and set render="screen" below) to show the game window
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 
 sys.path.insert(0, 'evoman') 
@@ -44,10 +44,9 @@ if algorithm not in ['NEAT', 'SANE', 'ESP']:
     sys.exit("Error: please specify the algorithm using 'NEAT' or 'SANE' or 'ESP' for upgraded SANE")
 
 # Load config
-if algorithm in ['SANE', 'ESP']:
-    config = configparser.RawConfigParser()
-    config.read(f'{algorithm}.cfg')
-    cfg = dict(config.items(algorithm))
+config = configparser.RawConfigParser()
+config.read(f'{algorithm}.cfg')
+cfg = dict(config.items(algorithm))
 
 # Second argument must specify the enemy to be trained on - integer from 1 - 8
 try:
@@ -118,7 +117,8 @@ env = Environment(experiment_name=experiment_name,
                   enemymode="static",
                   level=2,
                   logs = "off",
-                  speed="fastest")
+                  speed="fastest",
+                  render="none")
     
 # Run the optimizations the specified number of times
 # Each run gets their own folder run# inside the original folder
@@ -136,7 +136,7 @@ for it in range(1,runs+1):
     tstart = time()
     
     if algorithm == 'NEAT':
-        optimizer = NEAT_Spealist(env, gens, picklepath, logpath, mode)
+        optimizer = NEAT_Spealist(env, gens, picklepath, logpath, mode, int(cfg.get('workers', 1)))
     elif algorithm == 'SANE':
         optimizer = SANE_Specialist(env, gens, picklepath, logpath, cfg, mode)
     elif algorithm == 'ESP':
@@ -37,7 +37,8 @@ env = Environment(experiment_name=experiment_name,
                   player_controller=player_controller(n_hidden_neurons),
                   enemymode="static",
                   level=2,
-                  speed="fastest")
+                  speed="fastest",
+                  profile="off")   # "on" reports where the time of each generation goes
 
 # default environment fitness is assumed for experiment
 
@@ -269,6 +270,8 @@ for i in range(ini_g+1, gens):
     file_aux.write('\n'+str(i)+' '+str(round(fit_pop[best],6))+' '+str(round(mean,6))+' '+str(round(std,6))   )
     file_aux.close()
 
+    env.profile_report() # time spent in each phase of the game loop, if profiling
+
     # saves generation number
     file_aux  = open(experiment_name+'/gen.txt','w')
     file_aux.write(str(i))
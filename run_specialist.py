@@ -101,6 +101,9 @@ experiment_name = "specialists/" + algorithm + "_e" + str(enemy) + "_i" + str(it
 solutionfile = "solutions/" + algorithm + "_e" + str(enemy) + ".pkl"
 #solutionfile = "solutions/[insert name here]"
 
+# Seed of the first game, game i plays with seed + i - 1 so every run can be reproduced. Set to None for random games
+seed = 0
+
 gain_path = experiment_name + "/gain.txt"
 print("Logs will be saved at:", experiment_name)
 print("Individual gain will be saved at:", gain_path)
@@ -145,7 +148,7 @@ list_gain = []
 if all == 'yes':
     for game in all_enemies:
         env.update_parameter("enemies", [game])
-        f, p, e, t = env.play(sol)
+        f, p, e, t = env.play(sol, seed=seed)
         gain = p - e
         list_gain.append(gain)
         file = open(gain_path, "a")
@@ -158,7 +161,7 @@ else:
         # speed up runs after the first one
         if it == 2: env.update_parameter("speed", "fastest")
         
-        f, p, e, t = env.play(sol)
+        f, p, e, t = env.play(sol, seed=None if seed is None else seed + it - 1)
         
         # calculate individual gain
         #energy_player = env.get_playerlife()